@@ -1,23 +1,20 @@
 """Anne 聊天记录 API"""
 
-import asyncio
-import functools
 from typing import List, Optional, Union
 
 from bs4 import BeautifulSoup
 from gsuid_core.logger import logger
 
+from ..utils.api.api import ANNEHOST
+from ..utils.api.cache import response_cache
+from ..utils.api.cf_session import cf_session
+from ..utils.api.resilience import TIMEOUTS, retry_call
+from ..utils.api.scrape_pool import scrape_pool
+from ..utils.api.singleflight import make_key, single_flight
+from ..utils.api.strainer import CHAT_ONLY
 from .models import ChatMessage
 
-try:
-    import cloudscraper
-
-    _scraper = cloudscraper.create_scraper()
-except ImportError:
-    _scraper = None
-    logger.warning("[l4_chat] cloudscraper 未安装")
-
-CHAT_HOST = "https://anne.trygek.com"
+CHAT_HOST = ANNEHOST
 CHAT_URL = f"{CHAT_HOST}/chat/"
 ANNEWEB_COOKIE = "ANNEWEB_STEAM=c154aac293df935767611f2b72eae854"
 
@@ -29,32 +26,39 @@ class ChatApi:
         self._session = None
 
     def _get_scraper(self):
-        return _scraper
+        return cf_session if cf_session.available else None
 
     async def _fetch_html(self, url: str) -> Optional[str]:
+        """带缓存获取页面，相同 URL 的并发请求合并为一次"""
+        key = make_key("GET", url)
+        return await response_cache.get_or_fetch(
+            "chat",
+            key,
+            lambda: single_flight.do(key, lambda: self._get_html(url)),
+        )
+
+    async def _get_html(self, url: str) -> Optional[str]:
         scraper = self._get_scraper()
         if scraper is None:
             return None
 
-        for attempt in range(3):
-            try:
-                func = functools.partial(
-                    scraper.get,
-                    url,
-                    timeout=30,
-                    cookies={"ANNEWEB_STEAM": "c154aac293df935767611f2b72eae854"},
-                )
-                resp = await asyncio.get_event_loop().run_in_executor(None, func)
-                if resp.status_code == 200:
-                    return resp.text
-                logger.warning(f"[l4_chat] 请求失败 (第{attempt + 1}/3次): status={resp.status_code}")
-                if attempt < 2:
-                    await asyncio.sleep(2)
-            except Exception as e:
-                logger.warning(f"[l4_chat] 请求异常: {e}")
-                if attempt < 2:
-                    await asyncio.sleep(2)
-        return None
+        resp = await retry_call(
+            url,
+            lambda: scrape_pool.run(
+                "page",
+                scraper.get,
+                url,
+                timeout=TIMEOUTS["chat"],
+                cookies={"ANNEWEB_STEAM": "c154aac293df935767611f2b72eae854"},
+            ),
+            None,
+            # Cloudflare 403 与 404 重试也不会变，不再重复请求
+            should_retry=lambda r: r.status_code not in (200, 403, 404),
+            tag="[l4_chat]",
+        )
+        if resp is None or resp.status_code != 200:
+            return None
+        return resp.text
 
     async def _parse_row(self, tr) -> Optional[ChatMessage]:
         """解析表格行"""
@@ -135,7 +139,7 @@ class ChatApi:
         if html is None:
             return -1
 
-        soup = BeautifulSoup(html, "lxml")
+        soup = BeautifulSoup(html, "lxml", parse_only=CHAT_ONLY)
         table = soup.find("table", class_="chat-table")
         if table is None:
             logger.warning("[l4_chat] 未找到聊天表格")
@@ -1,6 +1,8 @@
 # coding:utf-8
 
+import asyncio
 import json
+from typing import Optional, Set, Tuple
 
 from gsuid_core.bot import Bot
 from gsuid_core.logger import logger
@@ -8,17 +10,42 @@ from gsuid_core.models import Event
 from gsuid_core.sv import SV
 from gsuid_core.utils.image.image_tools import get_avatar_with_ring
 
-from ..utils.database.models import L4D2Bind
+from ..utils.database.models import L4D2Bind, L4D2GroupMember
 from ..utils.error_reply import get_error
 from ..utils.l4_api import l4_api
 from ..utils.l4_config import l4d2_config
 from .anne import get_anne_player_img, get_anne_search_img
 from .api58 import get_api58_player_img
 from .daidai import get_daidai_player_img
+from .rank import RANK_KEYS, get_group_rank_img, resolve_rank_key
 from .status import draw_awards_img, draw_server_status_img
 
 l4_user_info = SV("L4D2用户信息查询")
 
+# 本进程内已写入过的群成员，命中则不再访问数据库
+_known_members: Set[Tuple[str, str, str]] = set()
+_member_tasks: Set[asyncio.Task] = set()
+
+
+def _on_member_saved(key: Tuple[str, str, str], task: asyncio.Task):
+    _member_tasks.discard(task)
+    if task.cancelled() or task.exception() is not None:
+        _known_members.discard(key)
+        if not task.cancelled():
+            logger.warning(f"[l4] 记录群成员失败: {task.exception()!r}")
+
+
+def remember_member(user_id: str, bot_id: str, group_id: str) -> Optional[asyncio.Task]:
+    # 后台记录用户所在群，不阻塞查询；已记录过返回 None
+    key = (user_id, bot_id, group_id)
+    if key in _known_members:
+        return None
+    _known_members.add(key)
+    task = asyncio.create_task(L4D2GroupMember.remember(user_id, bot_id, group_id))
+    _member_tasks.add(task)
+    task.add_done_callback(lambda t: _on_member_saved(key, t))
+    return task
+
 
 @l4_user_info.on_command(("查询"), block=True)
 async def send_l4_info_msg(bot: Bot, ev: Event):
@@ -71,18 +98,20 @@ async def send_l4_info_msg(bot: Bot, ev: Event):
             else:
                 return await bot.send(get_error(-51))
 
-        out_msg = await get_daidai_player_img(arg)
+        out_msg = await get_daidai_player_img(arg, get_avatar_with_ring(ev), ev.user_id)
         return await bot.send(out_msg)
 
     uid32 = await L4D2Bind.get_steam32(user_id)
     if uid32 is None:
         return await bot.send(get_error(302))
+    if ev.group_id and user_id == ev.user_id:
+        remember_member(user_id, ev.bot_id, ev.group_id)
 
     if arg:
         uid32 = arg
 
     logger.info(f"[l4]电信anne服查询{uid32}")
-    out_msg = await get_anne_player_img(uid32, await get_avatar_with_ring(ev))
+    out_msg = await get_anne_player_img(uid32, get_avatar_with_ring(ev))
     await bot.send(out_msg)
 
 
@@ -104,12 +133,10 @@ async def search_l4_info_msg(bot: Bot, ev: Event):
 
 @l4_user_info.on_command(("状态"), block=True)
 async def send_server_status_msg(bot: Bot, ev: Event):
-    status = await l4_api.get_server_status()
-    if isinstance(status, int):
-        return await bot.send(get_error(status))
-    players = await l4_api.get_online_players()
-    if isinstance(players, int):
-        return await bot.send(get_error(players))
+    snapshot = await l4_api.get_status_snapshot()
+    if isinstance(snapshot, int):
+        return await bot.send(get_error(snapshot))
+    status, players = snapshot
     logger.info(f"状态数据: {json.dumps(status, ensure_ascii=False)}")
     logger.info(f"在线玩家: {json.dumps(players[:3], ensure_ascii=False)}")
     out_msg = await draw_server_status_img(status, players)
@@ -124,3 +151,19 @@ async def send_statistics_msg(bot: Bot, ev: Event):
     logger.info(f"荣誉数据: {json.dumps(awards[:3], ensure_ascii=False)}...")
     out_msg = await draw_awards_img(awards)
     await bot.send(out_msg)
+
+
+@l4_user_info.on_command(("排行"), block=True)
+async def send_group_rank_msg(bot: Bot, ev: Event):
+    if not ev.group_id:
+        return await bot.send("[l4] 请在群聊中使用该命令")
+    sort_key = resolve_rank_key(ev.text)
+    if sort_key is None:
+        return await bot.send(f"[l4] 可选排序: {' / '.join(RANK_KEYS)}")
+    task = remember_member(ev.user_id, ev.bot_id, ev.group_id)
+    if task is not None:
+        # 排行要包含发起人自己，等写入完成再读；失败已在回调里记录
+        await asyncio.wait({task})
+    logger.info(f"[l4]群{ev.group_id}排行, 排序{sort_key}")
+    out_msg = await get_group_rank_img(ev.group_id, sort_key)
+    await bot.send(out_msg)
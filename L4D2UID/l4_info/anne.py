@@ -1,18 +1,20 @@
+import asyncio
 import datetime
 import json
 import re
 from pathlib import Path
-from typing import Union
+from typing import Awaitable, Set, Union
 
 from gsuid_core.logger import logger
-from gsuid_core.utils.image.convert import convert_img
 from gsuid_core.utils.image.image_tools import draw_pic_with_ring, easy_paste
 from PIL import Image, ImageDraw
 
 from ..utils.api.models import AnnePlayer2
 from ..utils.error_reply import get_error
 from ..utils.l4_api import l4_api
+from ..utils.l4_config import l4d2_config
 from ..utils.l4_font import l4_font_20, l4_font_22, l4_font_26, l4_font_30, l4_font_36
+from ..utils.worker import worker_pool
 from .panel_redesign import (
     MARGIN_X,
     QUARTER_PANEL_CONFIGS,
@@ -96,12 +98,72 @@ async def get_anne_search_img(keyword: str) -> str:
     return search_msg
 
 
-async def get_anne_player_img(keyword: str, head_img: Image.Image) -> Union[str, bytes]:
-    detail = await l4_api.play_info(keyword)
+def _task_ok(task: asyncio.Future) -> bool:
+    return task.done() and not task.cancelled() and task.exception() is None
+
+
+# 超时后仍在后台跑完的查询，持有引用防止被回收
+_background: Set[asyncio.Task] = set()
+
+
+def _on_background_done(task: asyncio.Task):
+    _background.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"[l4] 后台查询失败: {task.exception()!r}")
+
+
+def _detach(*tasks: asyncio.Task):
+    # 只放弃等待不取消：请求在后台完成后写入缓存，下次查询直接命中，也不会打断重试和熔断探测
+    for task in tasks:
+        if not task.done():
+            _background.add(task)
+            task.add_done_callback(_on_background_done)
+
+
+async def get_anne_player_img(keyword: str, head_img: Awaitable[Image.Image]) -> Union[str, bytes]:
     now = datetime.datetime.now()
     quarter_id = f"{now.year}{(now.month - 1) // 3 + 1}"
     quarter_label = f"{now.year} Q{(now.month - 1) // 3 + 1}"
-    quarter_detail = await l4_api.play_info(keyword, quarter=quarter_id)
+
+    # 总榜 / 季度榜 / 头像并发获取，共用一个截止时间
+    timeout = int(l4d2_config.get_config("anne_query_timeout").data)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    detail_task = asyncio.create_task(l4_api.play_info(keyword))
+    quarter_task = asyncio.create_task(l4_api.play_info(keyword, quarter=quarter_id))
+    head_task = asyncio.ensure_future(head_img)
+
+    await asyncio.wait((detail_task,), timeout=timeout)
+    if not detail_task.done():
+        _detach(detail_task, quarter_task)
+        head_task.cancel()
+        logger.warning(f"[l4] 查询{keyword}超时 ({timeout}s), 请求转入后台继续")
+        return get_error(-1)
+    if not _task_ok(detail_task):
+        _detach(quarter_task)
+        head_task.cancel()
+        logger.warning(f"[l4] 查询{keyword}异常: {detail_task.exception()!r}")
+        return get_error(-1)
+    detail = detail_task.result()
+    if isinstance(detail, int) or detail is None:
+        # 总榜都查不到时季度数据没有意义，不再等待
+        _detach(quarter_task)
+        head_task.cancel()
+        return get_error(detail if isinstance(detail, int) else 401)
+
+    quarter_detail = None
+    await asyncio.wait((quarter_task, head_task), timeout=max(deadline - loop.time(), 0))
+    if _task_ok(quarter_task):
+        quarter_detail = quarter_task.result()
+    else:
+        _detach(quarter_task)
+        logger.warning(f"[l4] 季度数据获取失败或超时, 跳过季度面板: {keyword}")
+
+    if _task_ok(head_task):
+        avatar = head_task.result()
+    else:
+        head_task.cancel()
+        avatar = load_image(TEXTURED / "anne_head.jpg")
 
     logger.info(f"历史数据: {json.dumps(detail, ensure_ascii=False, default=str)}")
     if quarter_detail and not isinstance(quarter_detail, int):
@@ -110,14 +172,10 @@ async def get_anne_player_img(keyword: str, head_img: Image.Image) -> Union[str,
         if qs:
             logger.info(f"赛季标识: {qs}")
             quarter_label = qs
-    if isinstance(detail, int):
-        return get_error(detail)
-    if detail is None:
-        return get_error(401)
     if isinstance(quarter_detail, int):
         quarter_detail = None
 
-    return await draw_anne_player_img(detail, head_img, quarter_detail, quarter_label)
+    return await draw_anne_player_img(detail, avatar, quarter_detail, quarter_label)
 
 
 async def draw_anne_player_img(
@@ -125,10 +183,36 @@ async def draw_anne_player_img(
     head_img: Image.Image,
     quarter_detail: AnnePlayer2 | None = None,
     quarter_label: str = "",
+    title: str = "Anne 电信服 · 玩家数据统计",
+    source: str = "anne.trygek.com",
 ):
     if len(detail) == 0:
         return get_error(1001)
 
+    avatar_ring = await draw_pic_with_ring(head_img.resize((120, 120)), 120)
+    anne_ring = await draw_pic_with_ring(load_image(TEXTURED / "anne_head.jpg").resize((80, 80)), 80)
+    img = await worker_pool.run(
+        _render_anne_player_img,
+        detail,
+        avatar_ring,
+        anne_ring,
+        quarter_detail,
+        quarter_label,
+        title,
+        source,
+    )
+    return await worker_pool.convert_img(img)
+
+
+def _render_anne_player_img(
+    detail: AnnePlayer2,
+    avatar_ring: Image.Image,
+    anne_ring: Image.Image,
+    quarter_detail: AnnePlayer2 | None,
+    quarter_label: str,
+    title: str = "Anne 电信服 · 玩家数据统计",
+    source: str = "anne.trygek.com",
+) -> Image.Image:
     img = _prepare_background_image(900, 1600)
     draw = ImageDraw.Draw(img)
 
@@ -139,7 +223,7 @@ async def draw_anne_player_img(
 
     draw.text(
         (40, 22),
-        "Anne 电信服 · 玩家数据统计",
+        title,
         font=l4_font_30,
         fill=Colors.TEXT_DARK + (240,),
     )
@@ -154,8 +238,6 @@ async def draw_anne_player_img(
         width=1,
     )
 
-    avatar_resized = head_img.resize((120, 120))
-    avatar_ring = await draw_pic_with_ring(avatar_resized, 120)
     easy_paste(img, avatar_ring, (90, card_y + 25), direction="cc")
 
     info = detail["info"]
@@ -221,8 +303,6 @@ async def draw_anne_player_img(
             fill=Colors.ACCENT_YELLOW + (220,),
         )
 
-    anne_head = load_image(TEXTURED / "anne_head.jpg").resize((80, 80))
-    anne_ring = await draw_pic_with_ring(anne_head, 80)
     easy_paste(img, anne_ring, (780, card_y + 45), direction="cc")
 
     img_w = img.size[0]
@@ -304,12 +384,10 @@ async def draw_anne_player_img(
     )
     draw.text(
         (MARGIN_X + 15, footer_y + 10),
-        "数据来源: anne.trygek.com",
+        f"数据来源: {source}",
         font=l4_font_20,
         fill=Colors.TEXT_LIGHT_GRAY + (150,),
     )
 
     crop_h = min(footer_y + 80, img.size[1])
-    img = img.crop((0, 0, img.size[0], crop_h))
-
-    return await convert_img(img)
+    return img.crop((0, 0, img.size[0], crop_h))
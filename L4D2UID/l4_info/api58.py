@@ -1,12 +1,13 @@
 from typing import Dict, List, Union
 
 from gsuid_core.logger import logger
-from gsuid_core.utils.image.convert import convert_img
 from PIL import Image, ImageDraw
 
+from ..utils.api.models import Player58Response
 from ..utils.error_reply import get_error
 from ..utils.l4_api import l4_api
 from ..utils.l4_font import l4_font_20, l4_font_22, l4_font_26, l4_font_36
+from ..utils.worker import worker_pool
 
 BG = (18, 20, 26)
 CARD = (26, 29, 37)
@@ -84,7 +85,15 @@ async def get_api58_player_img(steam_id: str) -> Union[str, bytes]:
     detail = await l4_api.play_info_58(steam_id)
     if isinstance(detail, int):
         return get_error(detail)
+    return await draw_api58_player_img(detail)
 
+
+async def draw_api58_player_img(detail: Player58Response) -> Union[str, bytes]:
+    img = await worker_pool.run(_render_api58_player_img, detail)
+    return await worker_pool.convert_img(img)
+
+
+def _render_api58_player_img(detail: Player58Response) -> Image.Image:
     v5 = detail.get("v5") or {}
     v7 = detail.get("v7") or {}
     v2 = detail.get("v2") or {}
@@ -263,5 +272,4 @@ async def get_api58_player_img(steam_id: str) -> Union[str, bytes]:
             t(draw, hx + 340, wy, str(shots), FONT_SM, TEXT_DIM)
         y += box_h[2] + 16
 
-    img = img.crop((0, 0, W, y + 20))
-    return await convert_img(img)
+    return img.crop((0, 0, W, y + 20))
@@ -1,30 +1,122 @@
-from typing import Union
+import asyncio
+from typing import Awaitable, List, Optional, Union
+from urllib.parse import quote, urlsplit
 
-from gsuid_core.data_store import get_res_path
-from playwright.async_api import async_playwright
+from gsuid_core.logger import logger
+from PIL import Image
 
-from ..utils.api.api import DAIDAIPLAYERAPI
+from ..utils.api.api import DAIDAIHOST, DAIDAIPLAYERAPI
+from ..utils.api.resilience import TIMEOUTS
+from ..utils.browser_pool import browser_pool
+from ..utils.l4_api import l4_api
+from ..utils.l4_config import l4d2_config
+from ..utils.png_cache import daidai_png_cache
+from .anne import TEXTURED, _task_ok, draw_anne_player_img
+from .pil_utils import load_image
 
-L4PATH = get_res_path("L4D2UID")
+DAIDAI_DOMAIN = urlsplit(DAIDAIHOST).hostname or ""
+
+
+def _config_list(key: str) -> List[str]:
+    return [item.strip().lower() for item in l4d2_config.get_config(key).data.split(",") if item.strip()]
+
+
+def _host_match(host: str, domains: List[str]) -> bool:
+    return any(host == d or host.endswith(f".{d}") for d in domains)
+
+
+def is_blocked(url: str, resource_type: str) -> bool:
+    # 规则每次读取配置，修改后无需重启
+    if resource_type in _config_list("daidai_block_types"):
+        return True
+    host = (urlsplit(url).hostname or "").lower()
+    if not host or _host_match(host, [DAIDAI_DOMAIN]):
+        return False
+    return not _host_match(host, _config_list("daidai_allow_hosts"))
+
+
+async def _route(route):
+    request = route.request
+    if is_blocked(request.url, request.resource_type):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _setup_page(page):
+    await page.route("**/*", _route)
 
 
 async def get_daidai_player_img(
     keyword: str,
+    head_img: Optional[Awaitable[Image.Image]] = None,
+    user_id: str = "",
 ) -> Union[str, bytes]:
-    return await main(keyword)
+    head_task = asyncio.ensure_future(head_img) if head_img is not None else None
+    native = l4d2_config.get_config("daidai_mode").data == "native"
+    # 原生面板画有查询者头像，按用户分开缓存；截图不含头像，所有人共用
+    cached = await daidai_png_cache.get(keyword, (user_id, "") if native else ("",))
+    if cached is not None:
+        if head_task is not None:
+            head_task.cancel()
+        return cached
 
+    if native:
+        img = await _native_player_img(keyword, head_task)
+        if img is not None:
+            await daidai_png_cache.put(keyword, img, user_id)
+            return img
+        logger.info(f"[l4] 呆呆页面解析失败, 改用浏览器截图: {keyword}")
+    if head_task is not None:
+        head_task.cancel()
+    if not browser_pool.available:
+        return "[l4] 未安装 playwright，无法查询呆呆平台"
+    img = await main(keyword)
+    await daidai_png_cache.put(keyword, img)
+    return img
 
-async def main(name: str):
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
-        await page.goto(f"{DAIDAIPLAYERAPI}{name}")
 
-        await page.set_viewport_size({"width": 900, "height": 1200})
+async def _native_player_img(keyword: str, head_task: Optional[asyncio.Future]) -> Optional[bytes]:
+    # 直接请求页面并解析成与 anne 相同的数据结构，复用 anne 面板绘图，不需要浏览器
+    # 不再另设总超时：retry_call 自身按单次超时与重试次数收敛，外层截断只会打断重试
+    detail = await l4_api.play_info_daidai(keyword)
+    if isinstance(detail, int):
+        return None
+    avatar = load_image(TEXTURED / "anne_head.jpg")
+    if head_task is not None:
+        await asyncio.wait((head_task,), timeout=int(l4d2_config.get_config("anne_query_timeout").data))
+        if _task_ok(head_task):
+            avatar = head_task.result()
+        else:
+            head_task.cancel()
+    return await draw_anne_player_img(
+        detail,
+        avatar,
+        quarter_label="全部",
+        title="呆呆服 · 玩家数据统计",
+        source=DAIDAI_DOMAIN,
+    )
 
-        new_path = L4PATH.joinpath("daidai_screenshot.png")
-        await page.screenshot(path=new_path)  # 保存为图片
-        await browser.close()  # 关闭浏览器
-    with open(new_path, "rb") as f:
-        img = f.read()
-    return img
+
+async def main(name: str) -> bytes:
+    # 复用常驻浏览器的页面，查询耗时只剩页面加载
+    async with browser_pool.page(_setup_page) as page:
+        timeout = TIMEOUTS["daidai"] * 1000
+        # 不等 load 事件，DOM 就绪后等统计区域出现即可截图
+        await page.goto(f"{DAIDAIPLAYERAPI}{quote(name)}", wait_until="domcontentloaded", timeout=timeout)
+        selector = l4d2_config.get_config("daidai_selector").data
+        if selector:
+            try:
+                await page.wait_for_selector(selector, state="visible", timeout=timeout)
+            except Exception as e:
+                logger.warning(f"[l4] 呆呆页面等待 {selector} 超时, 直接截图: {e}")
+        return await _screenshot(page, selector)
+
+
+async def _screenshot(page, selector: str) -> bytes:
+    # 直接截成 bytes，不落盘，并发查询互不覆盖；只截统计区域，找不到时退回整页
+    if selector:
+        target = page.locator(selector).first
+        if await target.count():
+            return await target.screenshot(type="png")
+    return await page.screenshot(full_page=True, type="png")
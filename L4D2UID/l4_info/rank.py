@@ -0,0 +1,164 @@
+import asyncio
+import re
+import time
+from typing import Callable, Dict, List, Tuple, Union
+
+from gsuid_core.logger import logger
+from PIL import Image, ImageDraw
+
+from ..utils.api.cache import response_cache
+from ..utils.api.models import AnnePlayer2
+from ..utils.database.models import L4D2Bind
+from ..utils.database.profile_store import profile_store
+from ..utils.l4_api import l4_api
+from ..utils.l4_config import l4d2_config
+from ..utils.l4_font import l4_font_16, l4_font_20, l4_font_22, l4_font_30
+from ..utils.worker import worker_pool
+from .panel_redesign import MARGIN_X
+from .pil_utils import Colors
+from .status import _prepare_bg
+
+# 最多展示的行数
+RANK_LIMIT = 50
+ROW_H = 34
+_NUM = re.compile(r"-?\d+(?:\.\d+)?")
+# 仍在后台刷新的群，避免重复发起整群请求
+_refreshing: Dict[str, Tuple[asyncio.Task, Dict[str, AnnePlayer2]]] = {}
+
+
+def _num(text) -> float:
+    m = _NUM.search(str(text).replace(",", ""))
+    return float(m.group()) if m else 0.0
+
+
+# 排序项: (显示名, 取值函数, 格式化)
+RANK_KEYS: Dict[str, Tuple[str, Callable[[AnnePlayer2], float], Callable[[float], str]]] = {
+    "积分": ("积分", lambda p: _num(p["detail"]["source"]), lambda v: f"{v:,.0f}"),
+    "击杀": ("击杀", lambda p: _num(p["detail"]["kills"]), lambda v: f"{v:,.0f}"),
+    "爆头率": ("爆头率", lambda p: _num(p["detail"]["avg_headshots"]), lambda v: f"{v:.1f}%"),
+    "ppm": ("PPM", lambda p: _num(p["detail"]["avg_source"]), lambda v: f"{v:.2f}"),
+}
+RANK_ALIASES = {
+    "": "积分",
+    "分数": "积分",
+    "score": "积分",
+    "kills": "击杀",
+    "爆头": "爆头率",
+    "hs": "爆头率",
+}
+
+
+def resolve_rank_key(arg: str) -> Union[str, None]:
+    key = arg.strip().lower()
+    key = RANK_ALIASES.get(key, key)
+    return key if key in RANK_KEYS else None
+
+
+async def _refresh(steam_ids: List[str], out: Dict[str, AnnePlayer2]):
+    async for steam_id, result in l4_api.play_info_many(steam_ids):
+        if isinstance(result, dict):
+            out[steam_id] = result
+
+
+def _refresh_done(group_id: str, task: asyncio.Task):
+    _refreshing.pop(group_id, None)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"[l4] 群{group_id}排行后台刷新失败: {task.exception()!r}")
+
+
+async def get_group_rank_img(group_id: str, sort_key: str) -> Union[str, bytes]:
+    binds = await L4D2Bind.get_group_binds(group_id)
+    steam_ids = list(dict.fromkeys(b.steam32.strip() for b in binds if b.steam32))
+    if not steam_ids:
+        return "[l4] 本群还没有人绑定steam32，先使用 l4绑定 STEAM_1:0:xxx"
+
+    # 先用本地缓存，只对缺失或过期的玩家请求上游
+    stored = await profile_store.get_many(steam_ids)
+    ttl = response_cache.ttl_for("player")
+    now = time.time()
+    stale = [s for s in steam_ids if s not in stored or now - stored[s][1] >= ttl]
+    profiles: Dict[str, AnnePlayer2] = {s: stored[s][0] for s in steam_ids if s in stored}
+
+    note = ""
+    if stale:
+        running = _refreshing.get(group_id)
+        if running is None:
+            refreshed: Dict[str, AnnePlayer2] = {}
+            task = asyncio.create_task(_refresh(stale, refreshed))
+            _refreshing[group_id] = (task, refreshed)
+            task.add_done_callback(lambda t: _refresh_done(group_id, t))
+        else:
+            task, refreshed = running
+        timeout = int(l4d2_config.get_config("anne_query_timeout").data)
+        # 超时不取消，剩余玩家在后台继续刷新，下次查询直接命中缓存
+        await asyncio.wait((task,), timeout=timeout)
+        profiles.update(refreshed)
+        missing = sum(1 for s in stale if s not in refreshed)
+        if missing and not task.done():
+            note = f" · 部分刷新: {missing} 人仍在更新，稍后再查看"
+        elif missing:
+            note = f" · {missing} 人刷新失败，显示缓存数据"
+        logger.info(f"[l4] 群{group_id}排行: 共{len(steam_ids)}人, 刷新{len(stale) - missing}/{len(stale)}")
+
+    if not profiles:
+        return "[l4] 获取群成员数据失败，请稍后再试"
+
+    title, value_of, fmt = RANK_KEYS[sort_key]
+    rows = sorted(
+        ((p["info"]["name"] or s, value_of(p)) for s, p in profiles.items()),
+        key=lambda r: r[1],
+        reverse=True,
+    )
+    footer = f"共 {len(steam_ids)} 人已绑定 · 上榜 {len(rows)} 人{note}"
+    img = await worker_pool.run(
+        _render_rank_img,
+        [(name, fmt(value)) for name, value in rows[:RANK_LIMIT]],
+        title,
+        footer,
+    )
+    return await worker_pool.convert_img(img)
+
+
+def _render_rank_img(rows: List[Tuple[str, str]], title: str, footer: str) -> Image.Image:
+    img = _prepare_bg(900, 300 + len(rows) * ROW_H)
+    draw = ImageDraw.Draw(img)
+    w, _ = img.size
+
+    for i in range(3):
+        draw.rectangle([(0, i * 40), (900, i * 40 + 40)], fill=(56, 189, 248, int(80 * (1 - i / 3))))
+    draw.text((40, 22), f"Anne 电信服 · 群排行 ({title})", font=l4_font_30, fill=Colors.TEXT_DARK + (240,))
+
+    y = 140
+    draw.text((MARGIN_X + 10, y), "#", font=l4_font_20, fill=Colors.TEXT_LIGHT_GRAY + (200,))
+    draw.text((MARGIN_X + 70, y), "玩家", font=l4_font_20, fill=Colors.TEXT_LIGHT_GRAY + (200,))
+    draw.text((w - MARGIN_X - 160, y), title, font=l4_font_20, fill=Colors.TEXT_LIGHT_GRAY + (200,))
+    y += 32
+
+    medal = [Colors.ACCENT_YELLOW, Colors.TEXT_LIGHT_GRAY, Colors.ACCENT_RED]
+    for idx, (name, value) in enumerate(rows):
+        ry = y + idx * ROW_H
+        draw.rectangle(
+            [MARGIN_X, ry, w - MARGIN_X, ry + ROW_H],
+            fill=(17, 24, 39, 255) if idx % 2 == 0 else (13, 18, 30, 255),
+        )
+        color = medal[idx] if idx < len(medal) else Colors.ACCENT_CYAN
+        draw.text((MARGIN_X + 10, ry + 4), str(idx + 1), font=l4_font_22, fill=color + (255,))
+        draw.text((MARGIN_X + 70, ry + 6), name[:24], font=l4_font_20, fill=(255, 255, 255, 255))
+        draw.text((w - MARGIN_X - 160, ry + 4), value, font=l4_font_22, fill=color + (255,))
+
+    footer_y = y + len(rows) * ROW_H + 20
+    draw.rounded_rectangle(
+        [MARGIN_X, footer_y, w - MARGIN_X, footer_y + 40],
+        radius=8,
+        fill=Colors.PROFESSIONAL_BG + (200,),
+        outline=Colors.PROFESSIONAL_BORDER + (80,),
+        width=1,
+    )
+    draw.text((MARGIN_X + 15, footer_y + 10), footer, font=l4_font_16, fill=Colors.TEXT_LIGHT_GRAY + (180,))
+    draw.text(
+        (MARGIN_X, footer_y + 50),
+        "数据来源: anne.trygek.com",
+        font=l4_font_16,
+        fill=Colors.TEXT_LIGHT_GRAY + (150,),
+    )
+    return img.crop((0, 0, w, min(footer_y + 80, img.size[1])))
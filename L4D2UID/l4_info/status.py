@@ -7,6 +7,7 @@ from PIL import Image, ImageDraw
 
 from ..utils.api.models import AnneAward, AnneOnlinePlayer, AnneStatus
 from ..utils.l4_font import l4_font_16, l4_font_20, l4_font_22, l4_font_24, l4_font_26, l4_font_30
+from ..utils.worker import worker_pool
 from .panel_redesign import MARGIN_X, draw_dark_stat_card
 from .pil_utils import Colors, prepare_bg
 
@@ -50,6 +51,14 @@ async def draw_server_status_img(
     status: AnneStatus,
     players: List[AnneOnlinePlayer],
 ) -> Union[str, bytes]:
+    img = await worker_pool.run(_render_server_status_img, status, players)
+    return await worker_pool.convert_img(img)
+
+
+def _render_server_status_img(
+    status: AnneStatus,
+    players: List[AnneOnlinePlayer],
+) -> Image.Image:
     img = _prepare_bg(900, 1800)
     draw = ImageDraw.Draw(img)
     w, _ = img.size
@@ -199,8 +208,7 @@ async def draw_server_status_img(
     )
 
     crop_h = min(footer_y + 80, img.size[1])
-    img = img.crop((0, 0, img.size[0], crop_h))
-    return await convert_img(img)
+    return img.crop((0, 0, img.size[0], crop_h))
 
 
 async def draw_awards_img(awards: List[AnneAward]) -> Union[str, bytes]:
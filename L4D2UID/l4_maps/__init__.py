@@ -7,6 +7,8 @@ from gsuid_core.models import Event
 from gsuid_core.segment import MessageSegment
 from gsuid_core.sv import SV
 
+from ..utils.api.cf_session import cf_session
+from ..utils.api.scrape_pool import scrape_pool
 from .api import game_maps_api
 from .draw import draw_map_detail, draw_maps_list
 
@@ -164,16 +166,11 @@ async def send_l4_download_map_msg(bot: Bot, ev: Event):
 
     await bot.send(f"[l4] 开始下载 ({file_name})，文件较大请耐心等待...")
 
-    # 使用 cloudscraper 下载文件
+    # 复用已过盾的共享 cloudscraper 会话下载文件
     try:
-        import asyncio
-
-        import cloudscraper
-
-        scraper = cloudscraper.create_scraper()
 
         def _download():
-            r = scraper.get(dl_url, stream=True, timeout=300)
+            r = cf_session.get(dl_url, stream=True, timeout=300)
             r.raise_for_status()
             total = int(r.headers.get("content-length", 0))
             downloaded = 0
@@ -184,7 +181,8 @@ async def send_l4_download_map_msg(bot: Bot, ev: Event):
                         downloaded += len(chunk)
             return downloaded, total
 
-        downloaded, total = await asyncio.get_event_loop().run_in_executor(None, _download)
+        # 大文件走独立的下载线程，不占用页面/缩略图线程
+        downloaded, total = await scrape_pool.run("bulk", _download)
 
         size_mb = downloaded / 1024 / 1024
         await bot.send(f"[l4] 下载完成！\n文件: {file_name}\n大小: {size_mb:.1f} MB")
@@ -1,24 +1,19 @@
 """gamemaps.com API 客户端 - 使用 cloudscraper 绕过 Cloudflare 防护"""
 
-from asyncio import sleep
 from typing import List, Optional, Union
 
 from bs4 import BeautifulSoup
 from gsuid_core.logger import logger
 
+from ..utils.api.api import GAMEMAPS_HOST
+from ..utils.api.cache import response_cache
+from ..utils.api.cf_session import cf_session
+from ..utils.api.ratelimit import rate_limiter
+from ..utils.api.resilience import TIMEOUTS, retry_call
+from ..utils.api.scrape_pool import scrape_pool
+from ..utils.api.singleflight import make_key, single_flight
 from .models import GameMap, MapDetail
 
-try:
-    import cloudscraper
-
-    _scraper = cloudscraper.create_scraper()
-except ImportError:
-    _scraper = None
-    logger.warning("[l4_maps] cloudscraper 未安装，将使用 httpx（可能无法绕过 Cloudflare）")
-
-    _scraper = None
-
-GAMEMAPS_HOST = "https://www.gamemaps.com"
 L4D2_URL = f"{GAMEMAPS_HOST}/l4d2"
 
 
@@ -29,41 +24,43 @@ class GameMapsApi:
         self._session = None
 
     def _get_sync_scraper(self):
-        """获取同步 scraper 实例"""
-        if _scraper is not None:
-            return _scraper
-        return None
+        """获取共用的 Cloudflare 会话"""
+        return cf_session if cf_session.available else None
 
     async def _fetch_html(self, url: str) -> Optional[str]:
+        """带缓存获取页面 HTML，相同 URL 的并发请求合并为一次"""
+        key = make_key("GET", url)
+        endpoint = "map_detail" if "/details/" in url else "maps"
+        return await response_cache.get_or_fetch(
+            endpoint,
+            key,
+            lambda: single_flight.do(key, lambda: self._get_html(url)),
+        )
+
+    async def _get_html(self, url: str) -> Optional[str]:
         """获取页面 HTML（同步 cloudscraper 封装为异步）"""
         scraper = self._get_sync_scraper()
         if scraper is None:
             logger.error("[l4_maps] cloudscraper 不可用，无法获取页面")
             return None
 
-        for attempt in range(3):
-            try:
-                resp = await sleep(0, result=None)  # yield control
-                # 使用 run_in_executor 避免阻塞事件循环
-                import asyncio
-                import functools
-
-                func = functools.partial(scraper.get, url, timeout=30)
-                resp = await asyncio.get_event_loop().run_in_executor(None, func)
-                if resp.status_code == 200:
-                    return resp.text
-                elif resp.status_code == 403:
-                    logger.warning(f"[l4_maps] 请求被拒绝(403): {url}")
-                    return None
-                else:
-                    logger.warning(f"[l4_maps] 请求失败 (第{attempt + 1}/3次): status={resp.status_code}")
-                    if attempt < 2:
-                        await sleep(2)
-            except Exception as e:
-                logger.warning(f"[l4_maps] 请求异常 (第{attempt + 1}/3次): {e}")
-                if attempt < 2:
-                    await sleep(2)
-        return None
+        # 放到专用抓取线程池，避免阻塞事件循环
+        resp = await retry_call(
+            url,
+            lambda: scrape_pool.run("page", scraper.get, url, timeout=TIMEOUTS["gamemaps"]),
+            None,
+            should_retry=lambda r: r.status_code not in (200, 403, 404),
+            tag="[l4_maps]",
+        )
+        if resp is None:
+            return None
+        if resp.status_code == 403:
+            logger.warning(f"[l4_maps] 请求被拒绝(403): {url}")
+            return None
+        if resp.status_code != 200:
+            logger.warning(f"[l4_maps] 请求失败: status={resp.status_code}")
+            return None
+        return resp.text
 
     async def _parse_map_item(self, article) -> Optional[GameMap]:
         """解析单个地图列表项 article 元素"""
@@ -556,28 +553,22 @@ class GameMapsApi:
         if scraper is None:
             return -1
 
-        import asyncio
-        import functools
-
         try:
             # 先访问详情页
-            func = functools.partial(
-                scraper.get,
-                f"{GAMEMAPS_HOST}/details/{map_id}",
-                timeout=15,
-            )
-            await asyncio.get_event_loop().run_in_executor(None, func)
+            async with rate_limiter.slot(GAMEMAPS_HOST):
+                await scrape_pool.run("page", scraper.get, f"{GAMEMAPS_HOST}/details/{map_id}", timeout=15)
 
             # POST 获取下载重定向
-            func = functools.partial(
-                scraper.post,
-                url,
-                data={"ids[]": map_id, "noqueue": "true", "direct": "true"},
-                allow_redirects=False,
-                headers={"Referer": f"{GAMEMAPS_HOST}/details/{map_id}"},
-                timeout=15,
-            )
-            resp = await asyncio.get_event_loop().run_in_executor(None, func)
+            async with rate_limiter.slot(GAMEMAPS_HOST):
+                resp = await scrape_pool.run(
+                    "page",
+                    scraper.post,
+                    url,
+                    data={"ids[]": map_id, "noqueue": "true", "direct": "true"},
+                    allow_redirects=False,
+                    headers={"Referer": f"{GAMEMAPS_HOST}/details/{map_id}"},
+                    timeout=15,
+                )
 
             if resp.status_code == 302:
                 from urllib.parse import urljoin
@@ -1,7 +1,6 @@
 """地图列表图片渲染 - 使用 PIL 绘制深色风格图片"""
 
 import asyncio
-import functools
 import io
 from pathlib import Path
 from typing import List, Optional, Union
@@ -11,25 +10,21 @@ from gsuid_core.utils.image.convert import convert_img
 from PIL import Image, ImageDraw, ImageFont
 
 from ..l4_info.pil_utils import Colors, prepare_bg
+from ..utils.api.cf_session import cf_session
+from ..utils.api.ratelimit import rate_limiter
+from ..utils.api.scrape_pool import scrape_pool
 from ..utils.l4_font import l4_font_16, l4_font_20, l4_font_22, l4_font_30
+from ..utils.worker import worker_pool
 from .models import GameMap
 
-try:
-    import cloudscraper
-
-    _scraper = cloudscraper.create_scraper()
-except ImportError:
-    _scraper = None
-    logger.warning("[l4_maps] cloudscraper 未安装，无法下载缩略图")
-
 
 async def _download_thumb(url: str) -> Optional[Image.Image]:
     """使用 cloudscraper 下载缩略图（gamemaps.com 需要绕过 Cloudflare）"""
-    if not url or _scraper is None:
+    if not url or not cf_session.available:
         return None
     try:
-        func = functools.partial(_scraper.get, url, timeout=15)
-        resp = await asyncio.get_event_loop().run_in_executor(None, func)
+        async with rate_limiter.slot(url):
+            resp = await scrape_pool.run("image", cf_session.get, url, timeout=15)
         if resp.status_code == 200:
             return Image.open(io.BytesIO(resp.content)).convert("RGBA")
         logger.warning(f"[l4_maps] 缩略图下载失败: status={resp.status_code}")
@@ -107,10 +102,22 @@ def _truncate_text(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.FreeTyp
 
 async def draw_maps_list(maps: List[GameMap], section_title: str = "最新地图") -> Union[str, bytes]:
     """绘制地图列表图片"""
-    n = len(maps)
-    if n == 0:
+    if len(maps) == 0:
         return "没有找到相关地图"
 
+    # 先下载缩略图（并发数由 rate_limiter 控制），再把绘制交给工作池
+    thumbs = await asyncio.gather(*(_download_thumb(gm["thumb"]) for gm in maps[:18]))
+    img = await worker_pool.run(_render_maps_list, maps, list(thumbs), section_title)
+    return await worker_pool.convert_img(img)
+
+
+def _render_maps_list(
+    maps: List[GameMap],
+    thumbs: List[Optional[Image.Image]],
+    section_title: str,
+) -> Image.Image:
+    """绘制地图列表（同步，在工作池中执行）"""
+    n = len(maps)
     display_n = min(n, 18)  # 最多显示 18 个
     rows = (display_n + CARDS_PER_ROW - 1) // CARDS_PER_ROW
     img_h = max(600, 180 + rows * (CARD_H + CARD_GAP) + 100)
@@ -153,7 +160,7 @@ async def draw_maps_list(maps: List[GameMap], section_title: str = "最新地图
         # 绘制缩略图区域 (如果可用)
         thumb_y = cy + 15
         if gm["thumb"]:
-            thumb_img = await _download_thumb(gm["thumb"])
+            thumb_img = thumbs[idx]
             if thumb_img:
                 thumb_img = thumb_img.resize((CARD_W - 20, 150))
                 img.paste(thumb_img, (cx + 10, thumb_y), thumb_img)
@@ -299,8 +306,7 @@ async def draw_maps_list(maps: List[GameMap], section_title: str = "最新地图
     _draw_footer(draw, final_y)
 
     crop_h = min(final_y + 80, img.size[1])
-    img = img.crop((0, 0, img.size[0], crop_h))
-    return await convert_img(img)
+    return img.crop((0, 0, img.size[0], crop_h))
 
 
 async def draw_map_detail(detail) -> Union[str, bytes]:
@@ -2,9 +2,17 @@ from gsuid_core.logger import logger
 from gsuid_core.sv import SV, Bot, Event
 from gsuid_core.utils.message import send_diff_msg
 
+from ..utils.api.cache import negative_cache, response_cache
+from ..utils.api.ratelimit import rate_limiter
+from ..utils.api.resilience import circuit_breakers
+from ..utils.api.scrape_pool import scrape_pool
+from ..utils.api.singleflight import single_flight
+from ..utils.browser_pool import browser_pool
 from ..utils.database.models import L4D2Bind
 from ..utils.l4_config import l4d2_config
+from ..utils.png_cache import MB, daidai_png_cache
 from ..utils.steam_convert import to_steam32
+from ..utils.worker import worker_pool
 
 l4_user_bind = SV("L4D2用户绑定")
 l4_switch_paltform = SV("L4D2切换平台")
@@ -39,6 +47,7 @@ async def send_l4_bind_uid_msg(bot: Bot, ev: Event):
                 qid,
                 ev.bot_id,
                 uid,
+                ev.group_id,
             )
             return await send_diff_msg(
                 bot,
@@ -51,7 +60,7 @@ async def send_l4_bind_uid_msg(bot: Bot, ev: Event):
                 },
             )
         elif "切换" in ev.command:
-            retcode = await L4D2Bind.switch_steam32(qid, ev.bot_id, uid)
+            retcode = await L4D2Bind.switch_steam32(qid, ev.bot_id, uid, ev.group_id)
             if retcode == 0:
                 return await bot.send(f"[L4] 切换UID{uid}成功！")
             else:
@@ -174,3 +183,42 @@ async def send_l4_set_platform_msg(bot: Bot, ev: Event):
         return await bot.send(f"[l4] 无效平台！可选: {'/'.join(valid)}")
     l4d2_config.set_config("platform", platform)
     return await bot.send(f"[l4] 全局平台已切换为: {platform}")
+
+
+@l4_admin.on_command(
+    ("请求统计"),
+    block=True,
+)
+async def send_l4_request_stats_msg(bot: Bot, ev: Event):
+    sf = single_flight.stats()
+    rc = response_cache.stats()
+    nc = negative_cache.stats()
+    wp = worker_pool.stats()
+    lines = [
+        "[l4] 上游请求统计",
+        f"合并请求: {sf['coalesced']}/{sf['calls']} 次",
+        f"进行中: {sf['inflight']}",
+        f"缓存: 命中 {rc['hits']} / 过期命中 {rc['stale_hits']} / 未命中 {rc['misses']}",
+        f"缓存条数: {rc['size']} (后台刷新中 {rc['refreshing']})",
+        f"查无此人缓存: 命中 {nc['hits']} / 条数 {nc['size']}",
+        f"工作池: {wp['mode']} x{wp['size']} (执行中 {wp['running']} / 累计 {wp['submitted']})",
+    ]
+    bp = browser_pool.stats()
+    lines.append(
+        f"呆呆浏览器: {'运行中' if bp['running'] else '未启动'} "
+        f"(使用中 {bp['active']}/{bp['size']} / 空闲页 {bp['idle']} / 启动 {bp['launches']} 次)"
+    )
+    pc = daidai_png_cache.stats()
+    lines.append(
+        f"呆呆图片缓存: 命中 {pc['hits']} / 磁盘命中 {pc['disk_hits']} / 未命中 {pc['misses']} "
+        f"(内存 {pc['size']} 张 {pc['bytes'] / MB:.1f}MB / 磁盘 {pc['disk_size']} 张 {pc['disk_bytes'] / MB:.1f}MB)"
+    )
+    for lane, sp in scrape_pool.stats().items():
+        lines.append(
+            f"抓取线程 {lane}: x{sp['size']} (执行中 {sp['running']} / 排队 {sp['queued']} / 累计 {sp['submitted']})"
+        )
+    limits = rate_limiter.stats()
+    for host, state in circuit_breakers.states().items():
+        lim = limits.get(host, {"active": 0, "waiting": 0})
+        lines.append(f"{host}: {state} (进行中 {lim['active']} / 排队 {lim['waiting']})")
+    return await bot.send("\n".join(lines))
@@ -1,4 +1,7 @@
-ANNEHOST = "https://anne.trygek.com"
+import os
+
+# 上游地址可用环境变量覆盖，压测时指向本地模拟服务器（test/mock_upstream.py）
+ANNEHOST = os.getenv("L4D2UID_ANNE_HOST", "https://anne.trygek.com").rstrip("/")
 ANNEAPIHOST = f"{ANNEHOST}/stats"
 
 ANNESTATUSAPI = f"{ANNEAPIHOST}/"
@@ -7,8 +10,10 @@ ANNEAWARDSAPI = f"{ANNEAPIHOST}/awards/"
 ANNESEARCHAPI = f"{ANNEAPIHOST}/ranking/search.php"
 ANNEPLAYERAPI = f"{ANNEAPIHOST}/ranking/player.php"
 
-DAIDAIHOST = "https://stats.l4d2.cloud"
+DAIDAIHOST = os.getenv("L4D2UID_DAIDAI_HOST", "https://stats.l4d2.cloud").rstrip("/")
 DAIDAIPLAYERAPI: str = f"{DAIDAIHOST}/stats.php?searchTerm="
 
-API58HOST = "http://42.192.211.66:3000"
+API58HOST = os.getenv("L4D2UID_API58_HOST", "http://42.192.211.66:3000").rstrip("/")
 API58PLAYER = f"{API58HOST}/api/query-player"
+
+GAMEMAPS_HOST = os.getenv("L4D2UID_GAMEMAPS_HOST", "https://www.gamemaps.com").rstrip("/")
@@ -0,0 +1,212 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Protocol, Set, Tuple, TypeVar
+
+from gsuid_core.logger import logger
+
+from ..l4_config import l4d2_config
+
+T = TypeVar("T")
+
+# 端点 -> TTL 配置项
+ENDPOINT_TTL_CONFIG: Dict[str, str] = {
+    "player": "cache_ttl_player",
+    "search": "cache_ttl_player",
+    "58": "cache_ttl_player",
+    "status": "cache_ttl_status",
+    "chat": "cache_ttl_status",
+    "awards": "cache_ttl_awards",
+    "statistics": "cache_ttl_awards",
+    "maps": "cache_ttl_maps",
+    "map_detail": "cache_ttl_map_detail",
+}
+
+
+class CacheEntry:
+    __slots__ = ("value", "stored_at", "ttl")
+
+    def __init__(self, value: Any, stored_at: float, ttl: float):
+        self.value = value
+        self.stored_at = stored_at
+        self.ttl = ttl
+
+    @property
+    def expires_at(self) -> float:
+        return self.stored_at + self.ttl
+
+    @property
+    def stale_until(self) -> float:
+        # 过期后再保留一个 TTL 用于先返回旧值、后台刷新
+        return self.stored_at + self.ttl * 2
+
+
+class CacheBackend(Protocol):
+    def get(self, key: Hashable) -> Optional[CacheEntry]: ...
+
+    def set(self, key: Hashable, entry: CacheEntry) -> None: ...
+
+    def delete(self, key: Hashable) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def __len__(self) -> int: ...
+
+
+class MemoryLRUBackend:
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._data: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self._data.get(key)
+        if entry is not None:
+            self._data.move_to_end(key)
+        return entry
+
+    def set(self, key: Hashable, entry: CacheEntry) -> None:
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _is_cacheable(value: Any) -> bool:
+    if value is None or isinstance(value, int):
+        return False
+    status_code = getattr(value, "status_code", 200)
+    return status_code == 200
+
+
+class ResponseCache:
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        if backend is None:
+            backend = MemoryLRUBackend(int(l4d2_config.get_config("cache_max_entries").data))
+        self.backend: CacheBackend = backend
+        self._refreshing: Set[Hashable] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def ttl_for(endpoint: str) -> int:
+        config_key = ENDPOINT_TTL_CONFIG.get(endpoint)
+        if config_key is None:
+            return 0
+        return int(l4d2_config.get_config(config_key).data)
+
+    def put(self, endpoint: str, key: Hashable, value: Any):
+        ttl = self.ttl_for(endpoint)
+        if ttl > 0 and _is_cacheable(value):
+            self.backend.set(key, CacheEntry(value, time.time(), ttl))
+
+    def evict(self, key: Hashable):
+        self.backend.delete(key)
+
+    def stored_at(self, key: Hashable) -> Optional[float]:
+        entry = self.backend.get(key)
+        return entry.stored_at if entry is not None else None
+
+    async def get_or_fetch(
+        self,
+        endpoint: str,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[T]],
+    ) -> T:
+        if self.ttl_for(endpoint) <= 0:
+            return await fetch()
+
+        entry = self.backend.get(key)
+        now = time.time()
+        if entry is not None and now < entry.expires_at:
+            self.hits += 1
+            return entry.value
+        if entry is not None and now < entry.stale_until:
+            self.stale_hits += 1
+            self._refresh(endpoint, key, fetch)
+            return entry.value
+
+        self.misses += 1
+        value = await fetch()
+        if (value is None or isinstance(value, int)) and entry is not None:
+            # 上游失败/熔断时退回已过期的旧数据
+            logger.warning(f"[l4] 上游不可用, 返回过期缓存 ({endpoint})")
+            return entry.value
+        self.put(endpoint, key, value)
+        return value
+
+    def _refresh(self, endpoint: str, key: Hashable, fetch: Callable[[], Awaitable[Any]]):
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        async def _run():
+            try:
+                self.put(endpoint, key, await fetch())
+            except Exception as e:
+                logger.warning(f"[l4] 缓存后台刷新失败 ({endpoint}): {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.create_task(_run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "size": len(self.backend),
+            "refreshing": len(self._refreshing),
+        }
+
+
+class NegativeCache:
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data: OrderedDict[Hashable, Tuple[int, float]] = OrderedDict()
+        self.hits = 0
+
+    @staticmethod
+    def ttl() -> int:
+        return int(l4d2_config.get_config("cache_ttl_negative").data)
+
+    def get(self, key: Hashable) -> Optional[int]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        code, expires_at = item
+        if time.time() >= expires_at:
+            self._data.pop(key, None)
+            return None
+        self.hits += 1
+        return code
+
+    def put(self, key: Hashable, code: int):
+        ttl = self.ttl()
+        if ttl <= 0:
+            return
+        self._data[key] = (code, time.time() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "size": len(self._data)}
+
+
+response_cache = ResponseCache()
+negative_cache = NegativeCache()
@@ -0,0 +1,124 @@
+import json
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+from gsuid_core.data_store import get_res_path
+from gsuid_core.logger import logger
+from gsuid_core.server import on_core_shutdown
+
+from ..l4_config import l4d2_config
+from .scrape_pool import LANE_CONFIG
+
+try:
+    import cloudscraper
+except ImportError:
+    cloudscraper = None
+    logger.warning("[l4] cloudscraper 未安装，gamemaps / 聊天页将无法获取")
+
+COOKIE_PATH = get_res_path("L4D2UID") / "cf_session.json"
+
+
+def _cookie_key(cookie) -> Tuple[str, str, str]:
+    return cookie.domain, cookie.path, cookie.name
+
+
+class CloudflareSession:
+    # 全插件共用一个 cloudscraper 会话：各站点的 Cloudflare 通行 cookie 与 TLS 连接都复用，
+    # 并连同 User-Agent 一起落盘（cf_clearance 与 UA 绑定），重启后无需重新过盾
+    def __init__(self):
+        self._scraper = None
+        self._lock = threading.Lock()
+        self._saved: Dict[Tuple[str, str, str], str] = {}
+
+    @property
+    def scraper(self):
+        if self._scraper is None and cloudscraper is not None:
+            with self._lock:
+                if self._scraper is None:
+                    self._scraper = self._create()
+        return self._scraper
+
+    def _create(self):
+        scraper = cloudscraper.create_scraper()
+        # 连接池不小于抓取线程总数，避免并发时丢弃连接
+        pool_size = sum(max(int(l4d2_config.get_config(key).data), 1) for key in LANE_CONFIG.values())
+        for adapter in scraper.adapters.values():
+            if pool_size > adapter._pool_maxsize:
+                adapter.init_poolmanager(adapter._pool_connections, pool_size, block=adapter._pool_block)
+        self._load(scraper)
+        return scraper
+
+    def _load(self, scraper):
+        try:
+            data = json.loads(COOKIE_PATH.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"[l4] 读取 Cloudflare 会话失败: {e}")
+            return
+        now = time.time()
+        cookies: List[Dict[str, Any]] = [c for c in data.get("cookies", []) if c.get("expires", 0) > now]
+        if not cookies:
+            return
+        scraper.headers.update(data.get("headers", {}))
+        for c in cookies:
+            scraper.cookies.set(c["name"], c["value"], domain=c["domain"], path=c["path"], expires=c["expires"])
+        self._saved = {_cookie_key(c): c.value for c in scraper.cookies}
+        logger.info(f"[l4] 已恢复 {len(cookies)} 个 Cloudflare 会话 cookie")
+
+    def save(self):
+        scraper = self._scraper
+        if scraper is None:
+            return
+        with self._lock:
+            jar = list(scraper.cookies)
+            current = {_cookie_key(c): c.value for c in jar}
+            if current == self._saved:
+                return
+            # 只保存带过期时间的 cookie，会话 cookie 重启后本就失效
+            cookies = [
+                {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path, "expires": c.expires}
+                for c in jar
+                if c.expires
+            ]
+            data = {"headers": dict(scraper.headers), "cookies": cookies}
+            try:
+                COOKIE_PATH.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+            except OSError as e:
+                logger.warning(f"[l4] 保存 Cloudflare 会话失败: {e}")
+                return
+            self._saved = current
+
+    def request(self, method: str, url: str, **kwargs):
+        scraper = self.scraper
+        if scraper is None:
+            raise RuntimeError("cloudscraper 未安装")
+        resp = scraper.request(method, url, **kwargs)
+        # 过盾后拿到新的通行 cookie 时落盘
+        self.save()
+        return resp
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    @property
+    def available(self) -> bool:
+        return cloudscraper is not None
+
+    def close(self):
+        self.save()
+        if self._scraper is not None:
+            self._scraper.close()
+            self._scraper = None
+
+
+cf_session = CloudflareSession()
+
+
+@on_core_shutdown
+async def _close_cf_session():
+    cf_session.close()
@@ -0,0 +1,63 @@
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+from gsuid_core.logger import logger
+from gsuid_core.server import on_core_shutdown
+from httpx import AsyncClient, Limits
+
+from ..l4_config import l4d2_config
+
+try:
+    import h2  # noqa: F401
+
+    _HAS_H2 = True
+except ImportError:
+    _HAS_H2 = False
+
+
+class ClientPool:
+    def __init__(self):
+        self._clients: Dict[Tuple[str, bool], AsyncClient] = {}
+
+    def _new_client(self, verify: bool) -> AsyncClient:
+        http2 = bool(l4d2_config.get_config("http2").data)
+        if http2 and not _HAS_H2:
+            logger.warning("[l4] 未安装 h2，HTTP/2 已回退为 HTTP/1.1")
+            http2 = False
+        max_conn = int(l4d2_config.get_config("http_max_connections").data)
+        expiry = int(l4d2_config.get_config("http_keepalive_expiry").data)
+        return AsyncClient(
+            verify=verify,
+            http2=http2,
+            limits=Limits(
+                max_connections=max_conn,
+                max_keepalive_connections=max_conn,
+                keepalive_expiry=expiry,
+            ),
+        )
+
+    def get(self, url: str, verify: bool = True) -> AsyncClient:
+        parts = urlsplit(url)
+        key = (f"{parts.scheme}://{parts.netloc}", verify)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = self._new_client(verify)
+            self._clients[key] = client
+            logger.debug(f"[l4] 新建连接池: {key[0]}")
+        return client
+
+    async def close(self):
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            if not client.is_closed:
+                await client.aclose()
+
+
+client_pool = ClientPool()
+
+
+@on_core_shutdown
+async def _close_client_pool():
+    await client_pool.close()
+    logger.info("[l4] 已关闭 HTTP 连接池")
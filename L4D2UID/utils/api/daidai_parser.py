@@ -0,0 +1,115 @@
+import re
+from typing import Dict, Iterator, Tuple, Union
+
+from gsuid_core.logger import logger
+from lxml import etree, html
+
+from .models import AnnePlayer2
+from .player_parser import build_anne_player, empty_fields
+
+STEAMID_RE = re.compile(r"STEAM_[0-5]:[01]:\d+")
+_PAIR_RE = re.compile(r"^\s*([^:：]{1,16})\s*[:：]\s*(.+?)\s*$")
+
+# 含这些字的标签是排名/排行，不是数值本身，一律跳过（如“积分排名 | 第 3 名”）
+SKIP_LABELS = ("排名", "排行", "rank")
+
+# 呆呆统计页的标签 → 面板字段：(标签, 字段, 是否只允许完全相等)
+# 非完全相等的按前缀匹配，顺序即优先级，更具体的标签放前面
+LABEL_FIELDS: Tuple[Tuple[Tuple[str, ...], str, bool], ...] = (
+    (("爆头率", "headshot rate", "headshot %"), "avg_headshots", False),
+    (("近战", "melee"), "melee_charge", False),
+    (("ppm", "每分钟积分", "每分钟得分"), "ppm", False),
+    (("击杀", "kills"), "kills", False),
+    (("积分", "总积分", "分数", "score", "points"), "source", False),
+    (("游玩时长", "游戏时长", "在线时长", "总时长", "playtime", "play time"), "playtime", False),
+    (("最后上线", "最后在线", "最后游玩", "上次上线", "last online", "last seen", "last played"), "lasttime", False),
+    (("给药", "pills"), "pills_give", False),
+    (("给针", "adrenaline"), "adrenaline_give", False),
+    (("通关", "完成地图", "maps completed"), "map_clear", False),
+    (("玩家", "玩家名", "昵称", "名称", "name", "player"), "name", True),
+)
+
+# 页头、导航、页脚里的“标签: 值”与玩家数据无关
+_NOT_CHROME = "[not(ancestor::nav or ancestor::header or ancestor::footer)]"
+_X_STEAMID = etree.XPath("//text()[contains(., 'STEAM_')]/..")
+_X_ROWS = etree.XPath(".//tr[count(th|td)=2]" + _NOT_CHROME)
+_X_DT = etree.XPath(".//dt[following-sibling::*[1][self::dd]]" + _NOT_CHROME)
+_X_LEAF = etree.XPath(
+    ".//*[self::li or self::p or self::span or self::div][not(*[self::div or self::li or self::p])]" + _NOT_CHROME
+)
+_X_HEADING = etree.XPath(".//h1|.//h2|.//h3")
+_X_IMG = etree.XPath(".//img[contains(@src, 'steamstatic') or contains(@src, 'avatar')]")
+
+_PARSER = html.HTMLParser(encoding="utf-8")
+
+
+def _text(el) -> str:
+    return " ".join(el.text_content().split())
+
+
+def _pairs(container) -> Iterator[Tuple[str, str]]:
+    for tr in _X_ROWS(container):
+        cells = tr.xpath("th|td")
+        yield _text(cells[0]), _text(cells[1])
+    for dt in _X_DT(container):
+        yield _text(dt), _text(dt.getnext())
+    for el in _X_LEAF(container):
+        m = _PAIR_RE.match(_text(el))
+        if m:
+            yield m.group(1), m.group(2)
+
+
+def classify_label(label: str) -> Union[str, None]:
+    label = " ".join(label.split()).rstrip(":：").strip().lower()
+    if not label or any(k in label for k in SKIP_LABELS):
+        return None
+    for keywords, field, exact in LABEL_FIELDS:
+        if any(label == k or (not exact and label.startswith(k)) for k in keywords):
+            return field
+    return None
+
+
+def _collect(container) -> Dict[str, str]:
+    found: Dict[str, str] = {}
+    for label, val in _pairs(container):
+        field = classify_label(label)
+        # 同一字段只取第一次出现的值，后面的多为排行或说明文字
+        if field is None or field in found or not val:
+            continue
+        found[field] = val
+    return found
+
+
+def _stats_container(root) -> Tuple[object, Dict[str, str]]:
+    # 从 steamid 所在元素向外找，第一个带积分或击杀数据的祖先即统计区域，
+    # 只在该区域内取值，避免把页面其它位置的同名文字当成玩家数据
+    for el in _X_STEAMID(root):
+        for node in (el, *el.iterancestors()):
+            found = _collect(node)
+            if "source" in found or "kills" in found:
+                return node, found
+    return root, {}
+
+
+def parse_daidai_player(data: bytes) -> Union[AnnePlayer2, int]:
+    root = html.document_fromstring(data, parser=_PARSER)
+    steam_ids = list(dict.fromkeys(STEAMID_RE.findall(root.text_content())))
+    if len(steam_ids) != 1:
+        # 没找到或搜到多名玩家（搜索结果列表），交给截图兜底
+        logger.info(f"[l4] 呆呆页面匹配到 {len(steam_ids)} 个steamid, 无法解析为单个玩家")
+        return 401
+
+    container, found = _stats_container(root)
+    if not found:
+        logger.warning(f"[l4] 呆呆页面未找到积分/击杀数据: {data[:300]}")
+        return 401
+
+    fields = empty_fields()
+    fields.update(found)
+    fields["steamid"] = steam_ids[0]
+    if not fields["name"]:
+        heading = _X_HEADING(container)
+        fields["name"] = _text(heading[0]) if heading else steam_ids[0]
+    avatar = _X_IMG(container)
+    fields["avatar"] = avatar[0].get("src", "") if avatar else ""
+    return build_anne_player(fields)
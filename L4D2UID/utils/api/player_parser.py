@@ -0,0 +1,330 @@
+import re
+from typing import Dict, List, Optional, Union, cast
+
+from gsuid_core.logger import logger
+from lxml import etree, html
+
+from .models import (
+    AnnePlayer2,
+    AnnePlayerDetail,
+    AnnePlayerError,
+    AnnePlayerInf,
+    AnnePlayerInfAvg,
+    AnnePlayerInfo,
+    AnnePlayerSur,
+)
+
+RANK_RE = re.compile(r"第\s*([\d,]+)\s*名\s*/\s*共\s*([\d,]+)\s*名")
+
+
+def build_anne_player(
+    fields: Dict[str, str],
+    penalty: Optional[Dict[str, str]] = None,
+    support: Optional[Dict[str, str]] = None,
+) -> AnnePlayer2:
+    pmap = penalty or {}
+    smap = support or {}
+    if support is not None:
+        pills_give = smap.get("给药次数", fields["pills_give"])
+        adrenaline_give = smap.get("给针次数", fields["adrenaline_give"])
+    else:
+        pills_give = fields["pills_give"]
+        adrenaline_give = fields["adrenaline_give"]
+
+    info_dict = cast(
+        AnnePlayerInfo,
+        {
+            "name": fields["name"],
+            "avatar": fields["avatar"],
+            "steamid": fields["steamid"],
+            "playtime": fields["playtime"],
+            "lasttime": fields["lasttime"],
+            "quarter_scope": fields["quarter_scope"],
+            "total_rank": fields["total_rank"],
+            "total_rank_total": fields["total_rank_total"],
+            "quarter_rank": fields["quarter_rank"],
+            "quarter_rank_total": fields["quarter_rank_total"],
+        },
+    )
+    detail_dict = cast(
+        AnnePlayerDetail,
+        {
+            "rank": "N/A",
+            "source": fields["source"],
+            "avg_source": fields["ppm"],
+            "kills": fields["kills"],
+            "kills_people": "0",
+            "headshots": "0",
+            "avg_headshots": fields["avg_headshots"],
+            "map_play": "0",
+        },
+    )
+    error_dict = cast(
+        AnnePlayerError,
+        {
+            "mistake_shout": pmap.get("黑枪次数", "0"),
+            "kill_friend": pmap.get("杀死队友", "0"),
+            "down_friend": pmap.get("击倒队友", "0"),
+            "abandon_friend": pmap.get("放弃队友", "0"),
+            "put_into": pmap.get("让感染者进安全门", "0"),
+            "agitate_witch": pmap.get("惊扰 Witch", "0"),
+        },
+    )
+    inf_avg_dict = cast(
+        AnnePlayerInfAvg,
+        {
+            "avg_smoker": 0,
+            "avg_boomer": 0,
+            "avg_hunter": 0,
+            "avg_charger": 0,
+            "avg_spitter": 0,
+            "avg_jockey": 0,
+            "avg_tank": 0,
+        },
+    )
+    sur_dict = cast(
+        AnnePlayerSur,
+        {
+            "map_clear": fields["map_clear"],
+            "prefect_into": "0",
+            "get_oil": "0",
+            "ammo_arrange": "0",
+            "adrenaline_give": adrenaline_give,
+            "pills_give": pills_give,
+            "first_aid_give": smap.get("使用医疗包", "0"),
+            "friend_up": smap.get("扶起倒地队友", "0"),
+            "diss_friend": "0",
+            "save_friend": smap.get("电击救活队友", "0"),
+            "protect_friend": smap.get("保护队友(普感)", "0"),
+            "pro_from_smoker": "0",
+            "pro_from_hunter": "0",
+            "pro_from_charger": "0",
+            "pro_from_jockey": "0",
+            "melee_charge": fields["melee_charge"],
+            "tank_kill": "0",
+            "witch_instantly_kill": "0",
+        },
+    )
+    inf_dict = cast(
+        AnnePlayerInf,
+        {
+            "sur_ace": "0",
+            "sur_down": "0",
+            "boommer_hit": "0",
+            "hunter_prefect": "0",
+            "hunter_success": "0",
+            "tank_damage": "0",
+            "charger_multiple": "0",
+        },
+    )
+    out_dict = {
+        "kill_msg": "",
+        "info": info_dict,
+        "detail": detail_dict,
+        "inf_avg": inf_avg_dict,
+        "sur": sur_dict,
+        "inf": inf_dict,
+        "error": error_dict,
+    }
+    return cast(AnnePlayer2, out_dict)
+
+
+def classify_stat(label: str, val: str, kills_label: str, fields: Dict[str, str]):
+    if kills_label in label:
+        fields["kills"] = val
+    elif "爆头率" in label:
+        fields["avg_headshots"] = val
+    elif "PPM" in label or "每分钟积分" in label:
+        fields["ppm"] = val
+    elif "近战击杀" in label:
+        fields["melee_charge"] = val
+    elif label == "给药次数":
+        fields["pills_give"] = val
+    elif label == "给针次数":
+        fields["adrenaline_give"] = val
+    elif "地图通关" in label:
+        fields["map_clear"] = val
+
+
+def classify_meta(text: str, val: str, is_quarter: bool, fields: Dict[str, str]):
+    source_label = "季度积分" if is_quarter else "总积分"
+    playtime_label = "季度时长" if is_quarter else "游玩时长"
+    if source_label in text:
+        fields["source"] = val
+    elif playtime_label in text:
+        fields["playtime"] = val
+    elif "最后上线" in text:
+        fields["lasttime"] = text.replace("最后上线:", "").strip()
+
+
+def classify_rank(title: str, value_text: str, fields: Dict[str, str]):
+    m = RANK_RE.search(value_text)
+    rank_num = m.group(1).replace(",", "") if m else ""
+    rank_total = m.group(2).replace(",", "") if m else ""
+    if "总积分" in title:
+        fields["total_rank"] = rank_num
+        fields["total_rank_total"] = rank_total
+    elif "季度积分" in title:
+        fields["quarter_rank"] = rank_num
+        fields["quarter_rank_total"] = rank_total
+
+
+def empty_fields() -> Dict[str, str]:
+    fields = dict.fromkeys(
+        (
+            "name",
+            "avatar",
+            "steamid",
+            "playtime",
+            "lasttime",
+            "source",
+            "quarter_scope",
+            "total_rank",
+            "total_rank_total",
+            "quarter_rank",
+            "quarter_rank_total",
+        ),
+        "",
+    )
+    fields.update(
+        dict.fromkeys(
+            (
+                "kills",
+                "avg_headshots",
+                "ppm",
+                "melee_charge",
+                "pills_give",
+                "adrenaline_give",
+                "map_clear",
+            ),
+            "0",
+        )
+    )
+    return fields
+
+
+# ── lxml 后端：预编译 XPath ──
+
+
+def _cls(tag: str, name: str) -> str:
+    return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {name} ')]"
+
+
+_X_PROFILE = etree.XPath(f"//{_cls('div', 'profile-header')}")
+_X_AVATAR = etree.XPath(f".//{_cls('img', 'player-avatar')}")
+_X_INFO = etree.XPath(f".//{_cls('div', 'profile-info')}")
+_X_H2 = etree.XPath(".//h2")
+_X_BADGE = etree.XPath(f".//{_cls('span', 'steamid-badge')}")
+_X_META_DIV = etree.XPath(f".//{_cls('div', 'profile-meta')}")
+_X_META_ITEM = etree.XPath(f".//{_cls('div', 'meta-item')}")
+_X_STRONG = etree.XPath(".//strong")
+_X_SCOPE = etree.XPath(f"//{_cls('div', 'profile-scope-current')}")
+_X_RANK_OVERVIEW = etree.XPath(f"//{_cls('div', 'profile-rank-overview')}")
+_X_RANK_CARD = etree.XPath(f".//{_cls('section', 'profile-rank-card')}")
+_X_RANK_TITLE = etree.XPath(f".//{_cls('span', 'profile-rank-title')}")
+_X_RANK_VALUE = etree.XPath(f".//{_cls('div', 'profile-rank-value')}")
+_X_GRID = etree.XPath(f"//{_cls('div', 'stats-grid')}")
+_X_STAT_CARD = etree.XPath(f".//{_cls('div', 'stat-card')}")
+_X_LABEL = etree.XPath(f".//{_cls('span', 'label')}")
+_X_VAL = etree.XPath(f".//{_cls('span', 'val')}")
+_X_PANEL = etree.XPath(f"//{_cls('div', 'data-panel')}")
+_X_H3 = etree.XPath(".//h3")
+_X_LI = etree.XPath(".//li")
+_X_NAME = etree.XPath(f".//{_cls('span', 'name')}")
+_X_V = etree.XPath(f".//{_cls('span', 'v')}")
+
+_PARSER = html.HTMLParser(encoding="utf-8")
+
+
+def _first(xpath: etree.XPath, el) -> Optional[html.HtmlElement]:
+    found = xpath(el)
+    return found[0] if found else None
+
+
+def _text(el) -> str:
+    # 等价于 bs4 的 .text.strip()
+    return el.text_content().strip()
+
+
+def _stripped(el) -> str:
+    # 等价于 bs4 的 .get_text(strip=True)
+    return "".join(s.strip() for s in el.itertext())
+
+
+def _panel_map(panel) -> Dict[str, str]:
+    items: Dict[str, str] = {}
+    for li in _X_LI(panel):
+        name_el = _first(_X_NAME, li)
+        val_el = _first(_X_V, li)
+        if name_el is not None and val_el is not None:
+            items[_text(name_el)] = _text(val_el)
+    return items
+
+
+def _panel_by_title(panels: List, keyword: str):
+    for p in panels:
+        h3 = _first(_X_H3, p)
+        if h3 is not None and keyword in _text(h3):
+            return p
+    return None
+
+
+def parse_player_lxml(data: bytes, quarter: str | None = None) -> Union[AnnePlayer2, int]:
+    root = html.document_fromstring(data, parser=_PARSER)
+    is_quarter = quarter is not None
+    kills_label = "季度击杀数" if is_quarter else "总击杀数"
+    fields = empty_fields()
+
+    profile = _first(_X_PROFILE, root)
+    if profile is None:
+        logger.warning(f"[l4] 玩家页面无profile-header: {data[:300]}")
+        return 401
+    avatar_img = _first(_X_AVATAR, profile)
+    fields["avatar"] = avatar_img.get("src", "") if avatar_img is not None else ""
+    info_div = _first(_X_INFO, profile)
+    if info_div is not None:
+        h2 = _first(_X_H2, info_div)
+        if h2 is not None:
+            fields["name"] = (h2.text or "").strip()
+            badge = _first(_X_BADGE, h2)
+            if badge is not None:
+                fields["steamid"] = _text(badge)
+        meta_div = _first(_X_META_DIV, info_div)
+        for m in _X_META_ITEM(meta_div if meta_div is not None else info_div):
+            strong = _first(_X_STRONG, m)
+            val = _text(strong) if strong is not None else ""
+            classify_meta(_stripped(m), val, is_quarter, fields)
+
+    scope_el = _first(_X_SCOPE, root)
+    if scope_el is not None:
+        strong = _first(_X_STRONG, scope_el)
+        fields["quarter_scope"] = _text(strong) if strong is not None else ""
+
+    rank_overview = _first(_X_RANK_OVERVIEW, root)
+    if rank_overview is not None:
+        for card in _X_RANK_CARD(rank_overview):
+            title_el = _first(_X_RANK_TITLE, card)
+            value_el = _first(_X_RANK_VALUE, card)
+            classify_rank(
+                _stripped(title_el) if title_el is not None else "",
+                _stripped(value_el) if value_el is not None else "",
+                fields,
+            )
+
+    grid = _first(_X_GRID, root)
+    if grid is not None:
+        for card in _X_STAT_CARD(grid):
+            label_el = _first(_X_LABEL, card)
+            val_el = _first(_X_VAL, card)
+            if label_el is None or val_el is None:
+                continue
+            classify_stat(_text(label_el), _text(val_el), kills_label, fields)
+
+    panels = _X_PANEL(root)
+    penalty = _panel_by_title(panels, "扣分")
+    support = _panel_by_title(panels, "辅助")
+    return build_anne_player(
+        fields,
+        _panel_map(penalty) if penalty is not None else None,
+        _panel_map(support) if support is not None else None,
+    )
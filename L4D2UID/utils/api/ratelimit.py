@@ -0,0 +1,79 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+from urllib.parse import urlsplit
+
+from ..l4_config import l4d2_config
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        # asyncio.Lock 按等待顺序唤醒，保证先到先得
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostLimiter:
+    def __init__(self, concurrency: int, rate: float, burst: int):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = concurrency
+        self.waiting = 0
+        self.active = 0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        self.waiting += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            await self.bucket.acquire()
+            self.active += 1
+            try:
+                yield
+            finally:
+                self.active -= 1
+        finally:
+            self.semaphore.release()
+
+
+class RateLimiter:
+    def __init__(self):
+        self._limiters: Dict[str, HostLimiter] = {}
+
+    def get(self, url: str) -> HostLimiter:
+        host = urlsplit(url).netloc or url
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = self._limiters[host] = HostLimiter(
+                max(int(l4d2_config.get_config("host_concurrency").data), 1),
+                max(float(l4d2_config.get_config("host_rate").data), 0.1),
+                max(int(l4d2_config.get_config("host_burst").data), 1),
+            )
+        return limiter
+
+    def slot(self, url: str):
+        return self.get(url).slot()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {host: {"active": lim.active, "waiting": lim.waiting} for host, lim in self._limiters.items()}
+
+
+rate_limiter = RateLimiter()
@@ -1,28 +1,104 @@
+import asyncio
 import json as js
-from asyncio import sleep
+import time
 from copy import deepcopy
-from typing import Any, Dict, List, Literal, Optional, Union, cast
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+from urllib.parse import quote
 
 from bs4 import BeautifulSoup
 from gsuid_core.logger import logger
-from httpx import AsyncClient, ConnectError
-
-from .api import ANNEAWARDSAPI, ANNEPLAYERAPI, ANNESEARCHAPI, ANNESTATISTICSAPI, ANNESTATUSAPI, API58PLAYER
+from httpx import Response, TransportError
+
+from ..database.profile_store import profile_store
+from ..l4_config import l4d2_config
+from ..worker import worker_pool
+from .api import (
+    ANNEAWARDSAPI,
+    ANNEPLAYERAPI,
+    ANNESEARCHAPI,
+    ANNESTATISTICSAPI,
+    ANNESTATUSAPI,
+    API58PLAYER,
+    DAIDAIPLAYERAPI,
+)
+from .cache import negative_cache, response_cache
+from .client import client_pool
+from .daidai_parser import parse_daidai_player
 from .models import (
     AnneAward,
     AnneOnlinePlayer,
     AnnePlayer2,
-    AnnePlayerDetail,
-    AnnePlayerError,
-    AnnePlayerInf,
-    AnnePlayerInfAvg,
-    AnnePlayerInfo,
-    AnnePlayerSur,
     AnneStatistics,
     AnneStatus,
     Player58Response,
     UserSearch,
 )
+from .player_parser import (
+    build_anne_player,
+    classify_meta,
+    classify_rank,
+    classify_stat,
+    empty_fields,
+    parse_player_lxml,
+)
+from .resilience import TIMEOUTS, is_retryable_status, retry_call
+from .singleflight import make_key, single_flight
+from .strainer import AWARD_CATEGORY_STYLE, AWARDS_ONLY, SEARCH_ONLY, STATISTICS_ONLY, STATUS_ONLY
+
+_CACHE_ENDPOINTS: Dict[str, str] = {
+    ANNEPLAYERAPI: "player",
+    ANNESEARCHAPI: "search",
+    ANNESTATUSAPI: "status",
+    ANNEAWARDSAPI: "awards",
+    ANNESTATISTICSAPI: "statistics",
+}
+
+_T = TypeVar("_T")
+
+
+async def _bounded_as_completed(
+    keys: Iterable[str],
+    fetch: Callable[[str], Awaitable[_T]],
+    concurrency: Optional[int] = None,
+) -> AsyncIterator[Tuple[str, _T]]:
+    # 去重后并发执行，完成一个返回一个；调用方提前退出时取消剩余任务
+    if concurrency is None:
+        concurrency = int(l4d2_config.get_config("batch_concurrency").data)
+    sem = asyncio.Semaphore(max(concurrency, 1))
+
+    async def _one(key: str) -> Tuple[str, _T]:
+        async with sem:
+            return key, await fetch(key)
+
+    tasks = [asyncio.create_task(_one(key)) for key in dict.fromkeys(keys)]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            yield await fut
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _not_found(neg_key: Hashable, cache_key: Hashable, code: int):
+    # 查无此人/无结果的页面同样是 200，会按玩家 TTL 进入响应缓存；解析出错误码后移除，
+    # 只由较短的 cache_ttl_negative 覆盖，新玩家不会长时间查不到
+    response_cache.evict(cache_key)
+    negative_cache.put(neg_key, code)
 
 
 class L4D2Api:
@@ -36,6 +112,32 @@ class L4D2Api:
     }
     _COOKIE = "ANNEWEB_STEAM=c154aac293df935767611f2b72eae854"
 
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        header: Dict[str, str],
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> Union[Response, int]:
+        client = client_pool.get(url, self.ssl_verify)
+        return await retry_call(
+            url,
+            lambda: client.request(
+                method,
+                url=url,
+                headers=header,
+                params=params,
+                json=json,
+                data=data,
+                timeout=TIMEOUTS["anne"],
+            ),
+            -1,
+            should_retry=lambda r: is_retryable_status(r.status_code),
+            exceptions=(TransportError,),
+        )
+
     async def _l4_request(
         self,
         url: str,
@@ -52,25 +154,15 @@ class L4D2Api:
 
         if json:
             method = "POST"
-        for attempt in range(3):
-            try:
-                async with AsyncClient(verify=self.ssl_verify) as client:
-                    resp = await client.request(
-                        method,
-                        url=url,
-                        headers=header,
-                        params=params,
-                        json=json,
-                        data=data,
-                        timeout=300,
-                    )
-                break
-            except ConnectError as e:
-                logger.warning(f"[l4] 请求失败 (第{attempt + 1}/3次): {e}")
-                if attempt < 2:
-                    await sleep(2)
-                else:
-                    return -1
+        key = make_key(method, url, params, json or data)
+        endpoint = _CACHE_ENDPOINTS.get(url, "") if method == "GET" else ""
+        resp = await response_cache.get_or_fetch(
+            endpoint,
+            key,
+            lambda: single_flight.do(key, lambda: self._send(method, url, header, params, json, data)),
+        )
+        if isinstance(resp, int):
+            return resp
         if resp.status_code == 404:
             return 404
 
@@ -104,6 +196,16 @@ class L4D2Api:
             return raw_data
 
     async def search_player(self, keyword: str):
+        neg_key = ("search", keyword.strip())
+        code = negative_cache.get(neg_key)
+        if code is not None:
+            return code
+        result = await self._search_player(keyword)
+        if result == 401:
+            _not_found(neg_key, make_key("GET", ANNESEARCHAPI, {"q": keyword}), result)
+        return result
+
+    async def _search_player(self, keyword: str):
         data = await self._l4_request(
             ANNESEARCHAPI,
             params={"q": keyword},
@@ -113,7 +215,7 @@ class L4D2Api:
         if isinstance(data, int):
             return data
         if isinstance(data, bytes):
-            soup = BeautifulSoup(data, "lxml")
+            soup = BeautifulSoup(data, "lxml", parse_only=SEARCH_ONLY)
             tbody = soup.find("tbody")
             if tbody is None:
                 logger.warning(f"[l4] 搜索页面无tbody: {data[:500]}")
@@ -164,264 +266,155 @@ class L4D2Api:
         return None
 
     async def play_info(self, steam_id: str, quarter: str | None = None):
+        neg_key = ("player", steam_id.strip(), quarter or "")
+        code = negative_cache.get(neg_key)
+        if code is not None:
+            return code
+        # 先查本地已解析的玩家数据，命中则跳过请求与解析
+        stored = await profile_store.get(steam_id, quarter or "")
+        if stored is not None and time.time() - stored[1] < response_cache.ttl_for("player"):
+            return stored[0]
+        result, fetched_at = await self._fetch_play_info(steam_id, quarter)
+        if isinstance(result, dict):
+            await profile_store.put(steam_id, quarter or "", result, fetched_at)
+        elif result == 401:
+            _not_found(neg_key, make_key("GET", ANNEPLAYERAPI, self._player_params(steam_id, quarter)), result)
+        elif result == -1 and stored is not None:
+            logger.warning(f"[l4] 请求失败, 使用本地缓存数据: {steam_id} {quarter or ''}")
+            return stored[0]
+        return result
+
+    def play_info_many(
+        self,
+        steam_ids: Iterable[str],
+        quarter: str | None = None,
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[str, Union[AnnePlayer2, int]]]:
+        return _bounded_as_completed(steam_ids, lambda steam_id: self.play_info(steam_id, quarter), concurrency)
+
+    @staticmethod
+    def _player_params(steam_id: str, quarter: str | None = None) -> Dict[str, str]:
         params = {"steamid": steam_id}
         if quarter:
             params["quarter"] = quarter
+        return params
+
+    async def _fetch_play_info(
+        self, steam_id: str, quarter: str | None = None
+    ) -> Tuple[Union[AnnePlayer2, int, None], Optional[float]]:
+        params = self._player_params(steam_id, quarter)
         data = await self._l4_request(
             ANNEPLAYERAPI,
             params=params,
             out_type="html",
         )
+        # 取响应实际的抓取时间：过期缓存返回的旧页面不能按现在的时间写入本地
+        fetched_at = response_cache.stored_at(make_key("GET", ANNEPLAYERAPI, params))
         if isinstance(data, int):
-            return data
+            return data, fetched_at
         if isinstance(data, bytes):
-            soup = BeautifulSoup(data, "lxml")
+            if l4d2_config.get_config("player_parser").data == "lxml":
+                return await worker_pool.run(parse_player_lxml, data, quarter), fetched_at
+            return await worker_pool.run(self._parse_player_bs4, data, quarter), fetched_at
+        return None, fetched_at
+
+    def _parse_player_bs4(self, data: bytes, quarter: str | None = None) -> Union[AnnePlayer2, int]:
+        soup = BeautifulSoup(data, "lxml")
+        is_quarter = quarter is not None
+        kills_label = "季度击杀数" if is_quarter else "总击杀数"
+        fields = empty_fields()
+
+        # ── Profile header ──
+        profile = soup.find("div", class_="profile-header")
+        if profile is None:
+            logger.warning(f"[l4] 玩家页面无profile-header: {data[:300]}")
+            return 401
+        avatar_img = profile.find("img", class_="player-avatar")
+        fields["avatar"] = avatar_img.get("src", "") if avatar_img else ""
+        info_div = profile.find("div", class_="profile-info")
+        if info_div:
+            h2 = info_div.find("h2")
+            if h2:
+                fields["name"] = h2.contents[0].strip() if h2.contents else ""
+                badge = h2.find("span", class_="steamid-badge")
+                if badge:
+                    fields["steamid"] = badge.text.strip()
+            # 没有 profile-meta 时直接在 info_div 下找
+            meta_div = info_div.find("div", class_="profile-meta")
+            for m in (meta_div if meta_div is not None else info_div).find_all("div", class_="meta-item"):
+                strong = m.find("strong")
+                val = strong.text.strip() if strong else ""
+                classify_meta(m.get_text(strip=True), val, is_quarter, fields)
+
+        scope_el = soup.find("div", class_="profile-scope-current")
+        if scope_el:
+            strong = scope_el.find("strong")
+            fields["quarter_scope"] = strong.text.strip() if strong else ""
+
+        # ── Rank overview ──
+        rank_overview = soup.find("div", class_="profile-rank-overview")
+        if rank_overview:
+            for card in rank_overview.find_all("section", class_="profile-rank-card"):
+                title_el = card.find("span", class_="profile-rank-title")
+                value_el = card.find("div", class_="profile-rank-value")
+                classify_rank(
+                    title_el.get_text(strip=True) if title_el else "",
+                    value_el.get_text(strip=True) if value_el else "",
+                    fields,
+                )
 
-            is_quarter = quarter is not None
-            source_label = "季度积分" if is_quarter else "总积分"
-            playtime_label = "季度时长" if is_quarter else "游玩时长"
-            kills_label = "季度击杀数" if is_quarter else "总击杀数"
+        # ── Stats grid ──
+        grid = soup.find("div", class_="stats-grid")
+        if grid:
+            for card in grid.find_all("div", class_="stat-card"):
+                label_el = card.find("span", class_="label")
+                val_el = card.find("span", class_="val")
+                if not label_el or not val_el:
+                    continue
+                classify_stat(label_el.text.strip(), val_el.text.strip(), kills_label, fields)
+
+        # ── Data panels (扣分 / 辅助) ──
+        panels = soup.find_all("div", class_="data-panel")
+        penalty = self._panel_by_title(panels, "扣分")
+        support = self._panel_by_title(panels, "辅助")
+        return build_anne_player(
+            fields,
+            self._parse_panel_list(penalty) if penalty else None,
+            self._parse_panel_list(support) if support else None,
+        )
 
-            # ── Profile header ──
-            profile = soup.find("div", class_="profile-header")
-            if profile is None:
-                logger.warning(f"[l4] 玩家页面无profile-header: {data[:300]}")
-                return 401
-            avatar_img = profile.find("img", class_="player-avatar")
-            avatar = avatar_img.get("src", "") if avatar_img else ""
-            info_div = profile.find("div", class_="profile-info")
-            name = ""
-            steamid = ""
-            if info_div:
-                h2 = info_div.find("h2")
-                if h2:
-                    name = h2.contents[0].strip() if h2.contents else ""
-                    badge = h2.find("span", class_="steamid-badge")
-                    if badge:
-                        steamid = badge.text.strip()
-                meta_source = playtime = lasttime = ""
-                meta_div = info_div.find("div", class_="profile-meta")
-                if meta_div:
-                    for m in meta_div.find_all("div", class_="meta-item"):
-                        text = m.get_text(strip=True)
-                        strong = m.find("strong")
-                        val = strong.text.strip() if strong else ""
-                        if source_label in text:
-                            meta_source = val
-                        elif playtime_label in text:
-                            playtime = val
-                        elif "最后上线" in text:
-                            lasttime = text.replace("最后上线:", "").strip()
-                else:
-                    # fallback: direct children
-                    for m in info_div.find_all("div", class_="meta-item"):
-                        text = m.get_text(strip=True)
-                        strong = m.find("strong")
-                        val = strong.text.strip() if strong else ""
-                        if source_label in text:
-                            meta_source = val
-                        elif playtime_label in text:
-                            playtime = val
-                        elif "最后上线" in text:
-                            lasttime = text.replace("最后上线:", "").strip()
-            else:
-                meta_source = playtime = lasttime = ""
-
-            scope_el = soup.find("div", class_="profile-scope-current")
-            quarter_scope = scope_el.find("strong").text.strip() if scope_el else ""
-
-            # ── Rank overview ──
-            total_rank = total_rank_total = quarter_rank = quarter_rank_total = ""
-            rank_overview = soup.find("div", class_="profile-rank-overview")
-            if rank_overview:
-                rank_cards = rank_overview.find_all("section", class_="profile-rank-card")
-                for card in rank_cards:
-                    title_el = card.find("span", class_="profile-rank-title")
-                    title = title_el.get_text(strip=True) if title_el else ""
-                    value_el = card.find("div", class_="profile-rank-value")
-                    value_text = value_el.get_text(strip=True) if value_el else ""
-
-                    # Extract rank numbers from "第 X 名 / 共 Y 名"
-                    import re
-
-                    m = re.search(r"第\s*([\d,]+)\s*名\s*/\s*共\s*([\d,]+)\s*名", value_text)
-                    rank_num = m.group(1).replace(",", "") if m else ""
-                    rank_total = m.group(2).replace(",", "") if m else ""
-
-                    if "总积分" in title:
-                        total_rank = rank_num
-                        total_rank_total = rank_total
-                    elif "季度积分" in title:
-                        quarter_rank = rank_num
-                        quarter_rank_total = rank_total
-
-            # ── Stats grid ──
-            kills = avg_headshots = ppm_val = melee_charge = "0"
-            pills_give = adrenaline_give = map_clear = "0"
-            grid = soup.find("div", class_="stats-grid")
-            if grid:
-                for card in grid.find_all("div", class_="stat-card"):
-                    label_el = card.find("span", class_="label")
-                    val_el = card.find("span", class_="val")
-                    if not label_el or not val_el:
-                        continue
-                    label = label_el.text.strip()
-                    val = val_el.text.strip()
-                    if kills_label in label:
-                        kills = val
-                    elif "爆头率" in label:
-                        avg_headshots = val
-                    elif "PPM" in label or "每分钟积分" in label:
-                        ppm_val = val
-                    elif "近战击杀" in label:
-                        melee_charge = val
-                    elif label == "给药次数":
-                        pills_give = val
-                    elif label == "给针次数":
-                        adrenaline_give = val
-                    elif "地图通关" in label:
-                        map_clear = val
-
-            # ── Data panels (扣分 / 辅助 / 各模式 / 感染者击杀) ──
-            panels = soup.find_all("div", class_="data-panel")
-            penalty = self._panel_by_title(panels, "扣分")
-            support = self._panel_by_title(panels, "辅助")
-            mistake_shout = kill_friend = down_friend = "0"
-            abandon_friend = put_into = agitate_witch = "0"
-            if penalty:
-                pmap = self._parse_panel_list(penalty)
-                mistake_shout = pmap.get("黑枪次数", "0")
-                kill_friend = pmap.get("杀死队友", "0")
-                down_friend = pmap.get("击倒队友", "0")
-                abandon_friend = pmap.get("放弃队友", "0")
-                put_into = pmap.get("让感染者进安全门", "0")
-                agitate_witch = pmap.get("惊扰 Witch", "0")
-
-            first_aid_give = friend_up = "0"
-            save_friend = protect_friend = "0"
-            if support:
-                smap = self._parse_panel_list(support)
-                first_aid_give = smap.get("使用医疗包", "0")
-                pills_give = smap.get("给药次数", pills_give)
-                adrenaline_give = smap.get("给针次数", adrenaline_give)
-                friend_up = smap.get("扶起倒地队友", "0")
-                save_friend = smap.get("电击救活队友", "0")
-                protect_friend = smap.get("保护队友(普感)", "0")
-
-            info_dict = cast(
-                AnnePlayerInfo,
-                {
-                    "name": name,
-                    "avatar": avatar,
-                    "steamid": steamid,
-                    "playtime": playtime,
-                    "lasttime": lasttime,
-                    "quarter_scope": quarter_scope,
-                    "total_rank": total_rank,
-                    "total_rank_total": total_rank_total,
-                    "quarter_rank": quarter_rank,
-                    "quarter_rank_total": quarter_rank_total,
-                },
-            )
-            detail_dict = cast(
-                AnnePlayerDetail,
-                {
-                    "rank": "N/A",
-                    "source": meta_source,
-                    "avg_source": ppm_val,
-                    "kills": kills,
-                    "kills_people": "0",
-                    "headshots": "0",
-                    "avg_headshots": avg_headshots,
-                    "map_play": "0",
-                },
-            )
-            error_dict = cast(
-                AnnePlayerError,
-                {
-                    "mistake_shout": mistake_shout,
-                    "kill_friend": kill_friend,
-                    "down_friend": down_friend,
-                    "abandon_friend": abandon_friend,
-                    "put_into": put_into,
-                    "agitate_witch": agitate_witch,
-                },
-            )
-            inf_avg_dict = cast(
-                AnnePlayerInfAvg,
-                {
-                    "avg_smoker": 0,
-                    "avg_boomer": 0,
-                    "avg_hunter": 0,
-                    "avg_charger": 0,
-                    "avg_spitter": 0,
-                    "avg_jockey": 0,
-                    "avg_tank": 0,
-                },
-            )
-            sur_dict = cast(
-                AnnePlayerSur,
-                {
-                    "map_clear": map_clear,
-                    "prefect_into": "0",
-                    "get_oil": "0",
-                    "ammo_arrange": "0",
-                    "adrenaline_give": adrenaline_give,
-                    "pills_give": pills_give,
-                    "first_aid_give": first_aid_give,
-                    "friend_up": friend_up,
-                    "diss_friend": "0",
-                    "save_friend": save_friend,
-                    "protect_friend": protect_friend,
-                    "pro_from_smoker": "0",
-                    "pro_from_hunter": "0",
-                    "pro_from_charger": "0",
-                    "pro_from_jockey": "0",
-                    "melee_charge": melee_charge,
-                    "tank_kill": "0",
-                    "witch_instantly_kill": "0",
-                },
-            )
-            inf_dict = cast(
-                AnnePlayerInf,
-                {
-                    "sur_ace": "0",
-                    "sur_down": "0",
-                    "boommer_hit": "0",
-                    "hunter_prefect": "0",
-                    "hunter_success": "0",
-                    "tank_damage": "0",
-                    "charger_multiple": "0",
-                },
-            )
-            out_dict = {
-                "kill_msg": "",
-                "info": info_dict,
-                "detail": detail_dict,
-                "inf_avg": inf_avg_dict,
-                "sur": sur_dict,
-                "inf": inf_dict,
-                "error": error_dict,
-            }
-            return cast(AnnePlayer2, out_dict)
+    def play_info_58_many(
+        self,
+        steam_ids: Iterable[str],
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[str, Union[Player58Response, int]]]:
+        return _bounded_as_completed(steam_ids, self.play_info_58, concurrency)
+
+    async def _send_58(self, steam_id: str) -> Union[Response, int]:
+        client = client_pool.get(API58PLAYER, self.ssl_verify)
+        return await retry_call(
+            API58PLAYER,
+            lambda: client.get(
+                API58PLAYER,
+                params={"steamid": steam_id},
+                headers=self._HEADER,
+                timeout=TIMEOUTS["58"],
+            ),
+            -1,
+            should_retry=lambda r: is_retryable_status(r.status_code),
+            exceptions=(TransportError,),
+            tag="[l4] 58",
+        )
 
     async def play_info_58(self, steam_id: str) -> Union[Player58Response, int]:
-        for attempt in range(3):
-            try:
-                async with AsyncClient(verify=self.ssl_verify) as client:
-                    resp = await client.get(
-                        API58PLAYER,
-                        params={"steamid": steam_id},
-                        headers=self._HEADER,
-                        timeout=60,
-                    )
-                break
-            except ConnectError as e:
-                logger.warning(f"[l4] 58请求失败 (第{attempt + 1}/3次): {e}")
-                if attempt < 2:
-                    await sleep(2)
-                else:
-                    return -1
+        key = make_key("GET", API58PLAYER, {"steamid": steam_id})
+        resp = await response_cache.get_or_fetch(
+            "58",
+            key,
+            lambda: single_flight.do(key, lambda: self._send_58(steam_id)),
+        )
+        if isinstance(resp, int):
+            return resp
         if resp.status_code == 404:
             return 404
         try:
@@ -434,90 +427,146 @@ class L4D2Api:
             return 401
         return cast(Player58Response, raw["data"])
 
-    async def get_server_status(self) -> Union[AnneStatus, int]:
-        data = await self._l4_request(ANNESTATUSAPI, out_type="html")
-        if isinstance(data, int):
-            return data
-        if isinstance(data, bytes):
-            soup = BeautifulSoup(data, "lxml")
-            gstats = soup.find("div", class_="global-stats")
-            if gstats is None:
-                logger.warning(f"[l4] 状态页无global-stats: {data[:300]}")
-                return 401
-            stats: dict[str, str] = {}
-            for card in gstats.find_all("div", class_="gstat"):
-                num = card.find("div", class_="num")
-                label = card.find("div", class_="label")
-                if num and label:
-                    stats[label.text.strip()] = num.text.strip()
-            return cast(
-                AnneStatus,
-                {
-                    "total_players": stats.get("总玩家数", "0"),
-                    "total_kills": stats.get("总击杀数", "0"),
-                    "total_headshots": stats.get("总爆头数", "0"),
-                    "online_now": stats.get("当前在线", "0"),
-                    "today_online": stats.get("今日在线过", "0"),
-                    "active_30d": stats.get("30天内活跃", "0"),
-                },
+    async def _send_daidai(self, keyword: str) -> Union[Response, int]:
+        client = client_pool.get(DAIDAIPLAYERAPI, self.ssl_verify)
+        return await retry_call(
+            DAIDAIPLAYERAPI,
+            lambda: client.get(
+                f"{DAIDAIPLAYERAPI}{quote(keyword)}",
+                headers=self._HEADER,
+                timeout=TIMEOUTS["daidai"],
+            ),
+            -1,
+            should_retry=lambda r: is_retryable_status(r.status_code),
+            exceptions=(TransportError,),
+            tag="[l4] 呆呆",
+        )
+
+    async def play_info_daidai(self, keyword: str) -> Union[AnnePlayer2, int]:
+        keyword = keyword.strip()
+        neg_key = ("daidai", keyword)
+        code = negative_cache.get(neg_key)
+        if code is not None:
+            return code
+        key = make_key("GET", f"{DAIDAIPLAYERAPI}{quote(keyword)}")
+        resp = await response_cache.get_or_fetch(
+            "player",
+            key,
+            lambda: single_flight.do(key, lambda: self._send_daidai(keyword)),
+        )
+        if isinstance(resp, int):
+            return resp
+        if resp.status_code != 200:
+            return 404 if resp.status_code == 404 else -1
+        result = await worker_pool.run(parse_daidai_player, resp.content)
+        if result == 401:
+            _not_found(neg_key, key, result)
+        return result
+
+    def _parse_server_status(self, soup: BeautifulSoup, data: bytes) -> Union[AnneStatus, int]:
+        gstats = soup.find("div", class_="global-stats")
+        if gstats is None:
+            logger.warning(f"[l4] 状态页无global-stats: {data[:300]}")
+            return 401
+        stats: dict[str, str] = {}
+        for card in gstats.find_all("div", class_="gstat"):
+            num = card.find("div", class_="num")
+            label = card.find("div", class_="label")
+            if num and label:
+                stats[label.text.strip()] = num.text.strip()
+        return cast(
+            AnneStatus,
+            {
+                "total_players": stats.get("总玩家数", "0"),
+                "total_kills": stats.get("总击杀数", "0"),
+                "total_headshots": stats.get("总爆头数", "0"),
+                "online_now": stats.get("当前在线", "0"),
+                "today_online": stats.get("今日在线过", "0"),
+                "active_30d": stats.get("30天内活跃", "0"),
+            },
+        )
+
+    def _parse_online_players(self, soup: BeautifulSoup, data: bytes) -> Union[List[AnneOnlinePlayer], int]:
+        tbody = soup.find("tbody")
+        if tbody is None:
+            logger.warning(f"[l4] 在线玩家页无tbody: {data[:300]}")
+            return 401
+        players: List[AnneOnlinePlayer] = []
+        for tr in tbody.find_all("tr"):
+            tds = tr.find_all("td")
+            if len(tds) < 6:
+                continue
+            rank = tds[0].text.strip()
+            link = tds[1].find("a", class_="player-link")
+            name = link.text.strip() if link else tds[1].text.strip()
+            steamid = ""
+            if link and link.get("href"):
+                from urllib.parse import parse_qs, urlparse
+
+                qs = parse_qs(urlparse(link["href"]).query)
+                steamid = qs.get("steamid", [""])[0]
+            mode = tds[2].text.strip()
+            server = tds[3].text.strip()
+            score = tds[4].text.strip()
+            playtime = tds[5].text.strip()
+            players.append(
+                cast(
+                    AnneOnlinePlayer,
+                    {
+                        "rank": rank,
+                        "name": name,
+                        "steamid": steamid,
+                        "mode": mode,
+                        "server": server,
+                        "score": score,
+                        "playtime": playtime,
+                    },
+                )
             )
-        return 401
+        return players
 
-    async def get_online_players(self) -> Union[List[AnneOnlinePlayer], int]:
+    async def _fetch_status_page(
+        self,
+    ) -> Union[Tuple[Union[AnneStatus, int], Union[List[AnneOnlinePlayer], int]], int]:
+        # 状态页只请求/解析一次，两部分分别给出结果，各视图只因自己依赖的部分失败
         data = await self._l4_request(ANNESTATUSAPI, out_type="html")
         if isinstance(data, int):
             return data
         if isinstance(data, bytes):
-            soup = BeautifulSoup(data, "lxml")
-            tbody = soup.find("tbody")
-            if tbody is None:
-                logger.warning(f"[l4] 在线玩家页无tbody: {data[:300]}")
-                return 401
-            players: List[AnneOnlinePlayer] = []
-            for tr in tbody.find_all("tr"):
-                tds = tr.find_all("td")
-                if len(tds) < 6:
-                    continue
-                rank = tds[0].text.strip()
-                link = tds[1].find("a", class_="player-link")
-                name = link.text.strip() if link else tds[1].text.strip()
-                steamid = ""
-                if link and link.get("href"):
-                    from urllib.parse import parse_qs, urlparse
-
-                    qs = parse_qs(urlparse(link["href"]).query)
-                    steamid = qs.get("steamid", [""])[0]
-                mode = tds[2].text.strip()
-                server = tds[3].text.strip()
-                score = tds[4].text.strip()
-                playtime = tds[5].text.strip()
-                players.append(
-                    cast(
-                        AnneOnlinePlayer,
-                        {
-                            "rank": rank,
-                            "name": name,
-                            "steamid": steamid,
-                            "mode": mode,
-                            "server": server,
-                            "score": score,
-                            "playtime": playtime,
-                        },
-                    )
-                )
-            return players
+            soup = BeautifulSoup(data, "lxml", parse_only=STATUS_ONLY)
+            return self._parse_server_status(soup, data), self._parse_online_players(soup, data)
         return 401
 
+    async def get_status_snapshot(self) -> Union[Tuple[AnneStatus, List[AnneOnlinePlayer]], int]:
+        page = await self._fetch_status_page()
+        if isinstance(page, int):
+            return page
+        status, players = page
+        if isinstance(status, int):
+            return status
+        # 缺少玩家表时照常返回全服状态，在线列表为空
+        return status, players if isinstance(players, list) else []
+
+    async def get_server_status(self) -> Union[AnneStatus, int]:
+        page = await self._fetch_status_page()
+        if isinstance(page, int):
+            return page
+        return page[0]
+
+    async def get_online_players(self) -> Union[List[AnneOnlinePlayer], int]:
+        page = await self._fetch_status_page()
+        if isinstance(page, int):
+            return page
+        return page[1]
+
     async def get_awards(self) -> Union[List[AnneAward], int]:
         data = await self._l4_request(ANNEAWARDSAPI, out_type="html")
         if isinstance(data, int):
             return data
         if isinstance(data, bytes):
-            soup = BeautifulSoup(data, "lxml")
-            import re
-
+            soup = BeautifulSoup(data, "lxml", parse_only=AWARDS_ONLY)
             awards: List[AnneAward] = []
-            for cat_div in soup.find_all("div", style=re.compile(r"margin:\s*2rem\s+0\s+0\.8rem")):
+            for cat_div in soup.find_all("div", style=AWARD_CATEGORY_STYLE):
                 category = cat_div.text.strip()
                 grid = cat_div.find_next_sibling("div", class_="awards-grid")
                 if not grid:
@@ -565,7 +614,7 @@ class L4D2Api:
         if isinstance(data, int):
             return data
         if isinstance(data, bytes):
-            soup = BeautifulSoup(data, "lxml")
+            soup = BeautifulSoup(data, "lxml", parse_only=STATISTICS_ONLY)
             boxes = soup.find_all("div", class_="stat-box")
             stats: dict[str, str] = {}
             for box in boxes:
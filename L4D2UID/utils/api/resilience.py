@@ -0,0 +1,141 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, Tuple, Type, TypeVar
+from urllib.parse import urlsplit
+
+from gsuid_core.logger import logger
+
+from .ratelimit import rate_limiter
+
+T = TypeVar("T")
+
+# 各上游的单次请求超时（秒）
+TIMEOUTS: Dict[str, float] = {
+    "anne": 15,
+    "58": 15,
+    "chat": 20,
+    "gamemaps": 30,
+    "daidai": 20,
+}
+
+
+def is_retryable_status(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+class RetryPolicy:
+    def __init__(self, attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        # full jitter: [0, min(max, base * 2^n)]
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, host: str, failure_threshold: int = 3, recovery_timeout: float = 30):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._probing = False
+        # 半开状态只放行一个探测请求
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info(f"[l4] {self.host} 已恢复")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"[l4] {self.host} 连续失败 {self.failures} 次, 熔断 {self.recovery_timeout}s")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class CircuitBreakers:
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc or url
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(host)
+        return breaker
+
+    def states(self) -> Dict[str, str]:
+        return {host: b.state for host, b in self._breakers.items()}
+
+
+circuit_breakers = CircuitBreakers()
+DEFAULT_RETRY = RetryPolicy()
+
+
+async def retry_call(
+    url: str,
+    func: Callable[[], Awaitable[T]],
+    fallback: T,
+    should_retry: Callable[[T], bool] = lambda _: False,
+    exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+    tag: str = "[l4]",
+    policy: RetryPolicy = DEFAULT_RETRY,
+) -> T:
+    breaker = circuit_breakers.get(url)
+    if not breaker.allow():
+        logger.warning(f"{tag} {breaker.host} 熔断中, 跳过请求: {url}")
+        return fallback
+
+    # 半开探测只试一次
+    probe = breaker.state == CircuitBreaker.HALF_OPEN
+    attempts = 1 if probe else policy.attempts
+    settled = False
+    try:
+        for attempt in range(attempts):
+            try:
+                async with rate_limiter.slot(url):
+                    result = await func()
+            except exceptions as e:
+                logger.warning(f"{tag} 请求异常 (第{attempt + 1}/{attempts}次): {e}")
+            else:
+                if not should_retry(result):
+                    breaker.record_success()
+                    settled = True
+                    return result
+                logger.warning(f"{tag} 请求失败 (第{attempt + 1}/{attempts}次): {url}")
+            if attempt < attempts - 1:
+                await asyncio.sleep(policy.delay(attempt))
+        breaker.record_failure()
+        settled = True
+        return fallback
+    finally:
+        # 探测被取消或抛出未列出的异常时也按失败处理，否则探测名额不释放，半开状态永远拒绝请求
+        if probe and not settled:
+            breaker.record_failure()
@@ -0,0 +1,101 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Literal, Optional, TypeVar
+
+from gsuid_core.server import on_core_shutdown
+
+from ..l4_config import l4d2_config
+
+T = TypeVar("T")
+Lane = Literal["page", "image", "bulk"]
+
+# 各用途独立线程池：大文件下载不会占满页面和缩略图的线程
+LANE_CONFIG: Dict[str, str] = {
+    "page": "scrape_page_workers",
+    "image": "scrape_image_workers",
+    "bulk": "scrape_bulk_workers",
+}
+
+
+class _LaneStats:
+    def __init__(self):
+        self.submitted = 0
+        self.queued = 0
+        self.running = 0
+
+
+class ScrapePool:
+    # cloudscraper 是同步库，统一放到这里执行，不占用 gsuid_core 的默认线程池
+    def __init__(self):
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._stats: Dict[str, _LaneStats] = {lane: _LaneStats() for lane in LANE_CONFIG}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def size(lane: Lane) -> int:
+        return max(int(l4d2_config.get_config(LANE_CONFIG[lane]).data), 1)
+
+    def _executor(self, lane: Lane) -> ThreadPoolExecutor:
+        executor = self._executors.get(lane)
+        if executor is None:
+            executor = ThreadPoolExecutor(self.size(lane), thread_name_prefix=f"l4_scrape_{lane}")
+            self._executors[lane] = executor
+        return executor
+
+    def _call(self, lane: Lane, func: Callable[[], T]) -> T:
+        stats = self._stats[lane]
+        with self._lock:
+            stats.queued -= 1
+            stats.running += 1
+        try:
+            return func()
+        finally:
+            with self._lock:
+                stats.running -= 1
+
+    async def run(self, lane: Lane, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        stats = self._stats[lane]
+        with self._lock:
+            stats.submitted += 1
+            stats.queued += 1
+        future = self._executor(lane).submit(self._call, lane, functools.partial(func, *args, **kwargs))
+        try:
+            return await asyncio.wrap_future(future)
+        finally:
+            # 还没开始执行就被取消时，排队计数由这里回退
+            if future.cancel():
+                with self._lock:
+                    stats.queued -= 1
+
+    def queue_depth(self, lane: Optional[Lane] = None) -> int:
+        with self._lock:
+            if lane is not None:
+                return self._stats[lane].queued
+            return sum(s.queued for s in self._stats.values())
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                lane: {
+                    "size": self.size(lane),  # type: ignore[arg-type]
+                    "submitted": s.submitted,
+                    "queued": s.queued,
+                    "running": s.running,
+                }
+                for lane, s in self._stats.items()
+            }
+
+    def shutdown(self):
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors.clear()
+
+
+scrape_pool = ScrapePool()
+
+
+@on_core_shutdown
+async def _close_scrape_pool():
+    scrape_pool.shutdown()
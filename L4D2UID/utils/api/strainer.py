@@ -0,0 +1,39 @@
+import re
+
+from bs4 import SoupStrainer
+
+
+class AnyOf(SoupStrainer):
+    # 任一子 strainer 命中即保留该子树；SoupStrainer 本身只能表达"且"
+    def __init__(self, *strainers: SoupStrainer):
+        super().__init__()
+        self.strainers = strainers
+
+    # bs4 >= 4.13
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return any(s.allow_tag_creation(nsprefix, name, attrs) for s in self.strainers)
+
+    def allow_string_creation(self, string) -> bool:
+        return False
+
+    # bs4 < 4.13
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        for s in self.strainers:
+            found = s.search_tag(markup_name, markup_attrs)
+            if found:
+                return found
+        return None
+
+
+# 荣誉页分类标题 div 没有 class，只能靠 style 识别
+AWARD_CATEGORY_STYLE = re.compile(r"margin:\s*2rem\s+0\s+0\.8rem")
+
+# 只构建解析需要的子树，跳过导航栏、脚本等
+SEARCH_ONLY = SoupStrainer("tbody")
+STATUS_ONLY = AnyOf(SoupStrainer("div", class_="global-stats"), SoupStrainer("tbody"))
+AWARDS_ONLY = AnyOf(
+    SoupStrainer("div", style=AWARD_CATEGORY_STYLE),
+    SoupStrainer("div", class_="awards-grid"),
+)
+STATISTICS_ONLY = SoupStrainer("div", class_=["stat-box", "infected-grid", "rank-trend-summary"])
+CHAT_ONLY = SoupStrainer("table", class_="chat-table")
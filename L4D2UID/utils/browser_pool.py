@@ -0,0 +1,177 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from gsuid_core.logger import logger
+from gsuid_core.server import on_core_shutdown, on_core_start
+
+from .l4_config import l4d2_config
+
+try:
+    from playwright.async_api import Browser, Page, Playwright, async_playwright
+except ImportError:
+    async_playwright = None
+    logger.warning("[l4] playwright 未安装，呆呆平台查询不可用")
+
+
+class BrowserPool:
+    # 常驻一个 Chromium，页面用完放回池中复用；空闲超时后关闭，下次使用时重新启动
+    def __init__(self):
+        self._playwright: Optional["Playwright"] = None
+        self._browser: Optional["Browser"] = None
+        self._idle: List["Page"] = []
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._lock = asyncio.Lock()
+        self._reaper: Optional[asyncio.Task] = None
+        self._last_used = 0.0
+        self.active = 0
+        self.launches = 0
+
+    @staticmethod
+    def size() -> int:
+        return max(int(l4d2_config.get_config("daidai_browser_pages").data), 1)
+
+    @staticmethod
+    def idle_timeout() -> int:
+        return int(l4d2_config.get_config("daidai_browser_idle").data)
+
+    @property
+    def available(self) -> bool:
+        return async_playwright is not None
+
+    def _healthy(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def _ensure_browser(self) -> "Browser":
+        async with self._lock:
+            if self._healthy():
+                return self._browser  # type: ignore[return-value]
+            if self._browser is not None:
+                logger.warning("[l4] 浏览器已断开，正在重新启动")
+            await self._close_browser()
+            start = time.perf_counter()
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch()
+            self.launches += 1
+            logger.info(f"[l4] 浏览器已启动 ({(time.perf_counter() - start) * 1000:.0f}ms)")
+            if self._reaper is None or self._reaper.done():
+                self._reaper = asyncio.create_task(self._reap_idle())
+            return self._browser
+
+    async def _new_page(self, setup: Optional[Callable[["Page"], Awaitable[None]]]) -> "Page":
+        browser = await self._ensure_browser()
+        try:
+            context = await browser.new_context(viewport={"width": 900, "height": 1200})
+        except Exception as e:
+            # 浏览器进程异常退出时 is_connected 可能还没更新，强制重启一次
+            logger.warning(f"[l4] 创建页面失败，重启浏览器: {e}")
+            await self.close()
+            browser = await self._ensure_browser()
+            context = await browser.new_context(viewport={"width": 900, "height": 1200})
+        page = await context.new_page()
+        # 拦截规则等只需在新页面上设置一次，复用的页面保留原设置
+        if setup is not None:
+            await setup(page)
+        return page
+
+    async def _acquire_page(self, setup: Optional[Callable[["Page"], Awaitable[None]]]) -> "Page":
+        while self._idle:
+            page = self._idle.pop()
+            if self._healthy() and not page.is_closed():
+                return page
+        return await self._new_page(setup)
+
+    async def _release_page(self, page: "Page", ok: bool):
+        # 出错的页面直接丢弃，避免残留状态影响下一次查询
+        if ok and self._healthy() and not page.is_closed() and len(self._idle) < self.size():
+            self._idle.append(page)
+            return
+        try:
+            await page.context.close()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def page(self, setup: Optional[Callable[["Page"], Awaitable[None]]] = None) -> AsyncIterator["Page"]:
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.size())
+        async with self._sem:
+            # 先计入使用中，避免取页面期间被空闲回收关闭
+            self.active += 1
+            page = None
+            ok = False
+            try:
+                page = await self._acquire_page(setup)
+                yield page
+                ok = True
+            finally:
+                self.active -= 1
+                self._last_used = time.monotonic()
+                if page is not None:
+                    await self._release_page(page, ok)
+
+    async def warm_up(self):
+        if not self.available:
+            return
+        try:
+            async with self.page():
+                pass
+        except Exception as e:
+            logger.warning(f"[l4] 浏览器预热失败: {e}")
+
+    async def _reap_idle(self):
+        while self._browser is not None:
+            await asyncio.sleep(30)
+            timeout = self.idle_timeout()
+            if timeout <= 0 or self.active or time.monotonic() - self._last_used <= timeout:
+                continue
+            async with self._lock:
+                if self.active == 0:
+                    logger.info(f"[l4] 浏览器空闲超过 {timeout}s，已关闭")
+                    await self.close()
+
+    async def _close_browser(self):
+        self._idle.clear()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+
+    async def close(self):
+        await self._close_browser()
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._healthy(),
+            "size": self.size(),
+            "active": self.active,
+            "idle": len(self._idle),
+            "launches": self.launches,
+        }
+
+
+browser_pool = BrowserPool()
+
+
+@on_core_start
+async def _warm_up_browser_pool():
+    # 只有全局平台为呆呆时才预热，其余情况首次使用时再启动
+    if l4d2_config.get_config("platform").data == "呆呆":
+        asyncio.create_task(browser_pool.warm_up())
+
+
+@on_core_shutdown
+async def _close_browser_pool():
+    if browser_pool._reaper is not None:
+        browser_pool._reaper.cancel()
+    await browser_pool.close()
@@ -1,10 +1,11 @@
-from typing import Optional
+from typing import List, Optional
 
 from gsuid_core.logger import logger
 from gsuid_core.utils.database.base_models import Bind, User, with_session
 from gsuid_core.utils.database.startup import exec_list
 from gsuid_core.webconsole.mount_app import GsAdminModel, PageSchema, site
-from sqlmodel import Field
+from sqlalchemy import UniqueConstraint, exists, or_
+from sqlmodel import Field, SQLModel, select
 
 from ..steam_convert import to_steam64
 
@@ -32,8 +33,9 @@ class L4D2Bind(Bind, table=True):
         user_id: str,
         bot_id,
         steam32: str,
+        group_id: Optional[str] = None,
     ) -> int:
-        """更改steam32的参数值，自动补齐steam64到uid字段"""
+        """更改steam32的参数值，自动补齐steam64到uid字段，并记录绑定所在群"""
         try:
             data = await cls.insert_data(user_id, bot_id, steam32=steam32)
         except Exception as e:
@@ -42,8 +44,27 @@ class L4D2Bind(Bind, table=True):
         if steam32:
             steam64 = to_steam64(steam32)
             await cls.update_data(user_id, bot_id, uid=steam64)
+        if group_id:
+            await L4D2GroupMember.remember(user_id, bot_id, group_id)
         return data
 
+    @classmethod
+    @with_session
+    async def get_group_binds(
+        cls,
+        session,
+        group_id: str,
+    ) -> List["L4D2Bind"]:
+        """获取在该群绑定或使用过命令、且已绑定steam32的所有记录"""
+        member = exists().where(
+            L4D2GroupMember.user_id == cls.user_id,
+            L4D2GroupMember.bot_id == cls.bot_id,
+            L4D2GroupMember.group_id == group_id,
+        )
+        # 兼容只在 Bind.group_id 记录了群号的旧数据
+        result = await session.execute(select(cls).where(or_(member, cls.group_id == group_id)))
+        return [row for row in result.scalars().all() if row.steam32]
+
     @classmethod
     @with_session
     async def get_steam32(
@@ -112,6 +133,33 @@ class L4D2Bind(Bind, table=True):
         return data.searchtype if data else None
 
 
+class L4D2GroupMember(SQLModel, table=True):
+    """用户所在的群，每个 (bot_id, user_id, group_id) 一行；同一用户可属于多个群"""
+
+    __table_args__ = (UniqueConstraint("bot_id", "user_id", "group_id"), {"extend_existing": True})
+    id: Optional[int] = Field(default=None, primary_key=True)
+    bot_id: str = Field(title="平台")
+    user_id: str = Field(title="账号")
+    group_id: str = Field(title="群号", index=True)
+
+    @classmethod
+    @with_session
+    async def remember(
+        cls,
+        session,
+        user_id: str,
+        bot_id,
+        group_id: str,
+    ):
+        """记录用户在该群出现过，已存在则跳过"""
+        found = await session.execute(
+            select(cls.id).where(cls.user_id == user_id, cls.bot_id == bot_id, cls.group_id == group_id)
+        )
+        if found.first() is None:
+            session.add(cls(user_id=user_id, bot_id=bot_id, group_id=group_id))
+            await session.commit()
+
+
 class L4D2User(User, table=True):
     __table_args__ = {"extend_existing": True}
     uid: Optional[str] = Field(default=None, title="L4D2UID")
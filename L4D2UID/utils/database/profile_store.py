@@ -0,0 +1,123 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from gsuid_core.data_store import get_res_path
+from gsuid_core.logger import logger
+from gsuid_core.server import on_core_shutdown
+
+from ..api.models import AnnePlayer2
+
+STORE_PATH = get_res_path("L4D2UID") / "profiles.db"
+# 超过 30 天未刷新的记录在启动时清理
+MAX_AGE = 30 * 86400
+
+
+class ProfileStore:
+    def __init__(self, path: Path = STORE_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS anne_profile ("
+                "steamid TEXT NOT NULL, "
+                "quarter TEXT NOT NULL DEFAULT '', "
+                "data TEXT NOT NULL, "
+                "fetched_at REAL NOT NULL, "
+                "PRIMARY KEY (steamid, quarter))"
+            )
+            deleted = conn.execute(
+                "DELETE FROM anne_profile WHERE fetched_at < ?",
+                (time.time() - MAX_AGE,),
+            ).rowcount
+            conn.commit()
+            if deleted:
+                logger.info(f"[l4] 已清理 {deleted} 条过期玩家缓存")
+            self._conn = conn
+        return self._conn
+
+    def _get(self, steamid: str, quarter: str) -> Optional[Tuple[AnnePlayer2, float]]:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT data, fetched_at FROM anne_profile WHERE steamid = ? AND quarter = ?",
+                    (steamid, quarter),
+                )
+                .fetchone()
+            )
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def _get_many(self, steamids: List[str], quarter: str) -> Dict[str, Tuple[AnnePlayer2, float]]:
+        out: Dict[str, Tuple[AnnePlayer2, float]] = {}
+        with self._lock:
+            conn = self._connect()
+            # 分批避免超出 SQLite 变量数上限
+            for i in range(0, len(steamids), 500):
+                chunk = steamids[i : i + 500]
+                rows = conn.execute(
+                    "SELECT steamid, data, fetched_at FROM anne_profile "
+                    f"WHERE quarter = ? AND steamid IN ({','.join('?' * len(chunk))})",
+                    (quarter, *chunk),
+                ).fetchall()
+                for steamid, data, fetched_at in rows:
+                    out[steamid] = (json.loads(data), fetched_at)
+        return out
+
+    def _put(self, steamid: str, quarter: str, profile: AnnePlayer2, fetched_at: float):
+        data = json.dumps(profile, ensure_ascii=False)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO anne_profile (steamid, quarter, data, fetched_at) VALUES (?, ?, ?, ?)",
+                (steamid, quarter, data, fetched_at),
+            )
+            conn.commit()
+
+    async def get(self, steamid: str, quarter: str = "") -> Optional[Tuple[AnnePlayer2, float]]:
+        try:
+            return await asyncio.to_thread(self._get, steamid.strip(), quarter)
+        except sqlite3.Error as e:
+            logger.warning(f"[l4] 读取玩家缓存失败: {e}")
+            return None
+
+    async def get_many(self, steamids: List[str], quarter: str = "") -> Dict[str, Tuple[AnnePlayer2, float]]:
+        try:
+            return await asyncio.to_thread(self._get_many, [s.strip() for s in steamids], quarter)
+        except sqlite3.Error as e:
+            logger.warning(f"[l4] 读取玩家缓存失败: {e}")
+            return {}
+
+    async def put(self, steamid: str, quarter: str, profile: AnnePlayer2, fetched_at: Optional[float] = None):
+        # fetched_at 为上游页面的实际抓取时间，默认为当前时间
+        if fetched_at is None:
+            fetched_at = time.time()
+        try:
+            await asyncio.to_thread(self._put, steamid.strip(), quarter, profile, fetched_at)
+        except sqlite3.Error as e:
+            logger.warning(f"[l4] 写入玩家缓存失败: {e}")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+profile_store = ProfileStore()
+
+
+@on_core_shutdown
+async def _close_profile_store():
+    profile_store.close()
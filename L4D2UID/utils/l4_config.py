@@ -2,7 +2,7 @@ from typing import Dict
 
 from gsuid_core.data_store import get_res_path
 from gsuid_core.utils.plugins_config.gs_config import StringConfig
-from gsuid_core.utils.plugins_config.models import GSC, GsIntConfig, GsStrConfig
+from gsuid_core.utils.plugins_config.models import GSC, GsBoolConfig, GsIntConfig, GsStrConfig
 
 CONIFG_DEFAULT: Dict[str, GSC] = {
     "platform": GsStrConfig(
@@ -22,6 +22,187 @@ CONIFG_DEFAULT: Dict[str, GSC] = {
         "l4聊天 不指定服务器时的默认服务器（留空为全部）",
         "",
     ),
+    "anne_query_timeout": GsIntConfig(
+        "查询超时",
+        "l4查询 等待上游数据的总秒数，季度数据超时则不显示季度面板；超时只放弃等待，请求在后台完成后写入缓存",
+        30,
+        max_value=300,
+    ),
+    "player_parser": GsStrConfig(
+        "玩家页解析器",
+        "l4查询 解析 anne 玩家页使用的后端，lxml 使用预编译 XPath，速度更快",
+        "bs4",
+        ["bs4", "lxml"],
+    ),
+    "worker_mode": GsStrConfig(
+        "解析绘图工作池",
+        "玩家页解析、图片绘制放到线程池或进程池中执行，避免阻塞 bot；进程池失败时自动退回线程池",
+        "thread",
+        ["thread", "process"],
+    ),
+    "worker_size": GsIntConfig(
+        "工作池大小",
+        "解析绘图工作池的线程/进程数，修改后重启生效",
+        2,
+        max_value=32,
+    ),
+    "scrape_page_workers": GsIntConfig(
+        "页面抓取线程数",
+        "gamemaps / 聊天页等 cloudscraper 页面请求的专用线程数，修改后重启生效",
+        4,
+        max_value=32,
+    ),
+    "scrape_image_workers": GsIntConfig(
+        "图片下载线程数",
+        "gamemaps 缩略图/截图下载的专用线程数，修改后重启生效",
+        4,
+        max_value=32,
+    ),
+    "scrape_bulk_workers": GsIntConfig(
+        "文件下载线程数",
+        "l4地图下载 大文件下载的专用线程数，超出的下载排队，修改后重启生效",
+        1,
+        max_value=8,
+    ),
+    "daidai_mode": GsStrConfig(
+        "呆呆查询方式",
+        "screenshot 使用浏览器截图；native（试验）直接解析呆呆页面并用本插件面板绘图，失败时退回截图",
+        "screenshot",
+        ["native", "screenshot"],
+    ),
+    "daidai_cache_ttl": GsIntConfig(
+        "呆呆图片缓存秒数",
+        "同一关键词（忽略大小写与多余空格）的呆呆查询结果图片缓存时间，0 为不缓存",
+        300,
+        max_value=86400,
+    ),
+    "daidai_cache_max_mb": GsIntConfig(
+        "呆呆图片缓存内存上限",
+        "呆呆结果图片在内存中的总大小上限（MB），超出后淘汰最久未使用的",
+        32,
+        max_value=1024,
+    ),
+    "daidai_cache_disk": GsBoolConfig(
+        "呆呆图片缓存落盘",
+        "开启后被挤出内存的图片写入磁盘（L4D2UID/daidai_cache），重启后仍可命中",
+        False,
+    ),
+    "daidai_cache_disk_mb": GsIntConfig(
+        "呆呆图片磁盘缓存上限",
+        "落盘缓存的总大小上限（MB），超出后删除最久未使用的",
+        256,
+        max_value=10240,
+    ),
+    "daidai_browser_pages": GsIntConfig(
+        "呆呆浏览器并发页数",
+        "呆呆平台查询常驻浏览器同时打开的页面数，超出的查询排队",
+        2,
+        max_value=8,
+    ),
+    "daidai_browser_idle": GsIntConfig(
+        "呆呆浏览器空闲关闭秒数",
+        "常驻浏览器空闲超过该秒数后关闭以释放内存，下次查询自动重启，0 为不关闭",
+        600,
+        max_value=86400,
+    ),
+    "daidai_selector": GsStrConfig(
+        "呆呆截图区域",
+        "呆呆玩家页等待并只截取匹配该 CSS 选择器的第一个元素，留空或找不到时截整页",
+        "main, #app, .container",
+    ),
+    "daidai_block_types": GsStrConfig(
+        "呆呆拦截资源类型",
+        "呆呆页面加载时直接拦截的资源类型，逗号分隔（可选 image/media/font/stylesheet/script/websocket 等）",
+        "media,font,websocket,eventsource,manifest",
+    ),
+    "daidai_allow_hosts": GsStrConfig(
+        "呆呆放行第三方域名",
+        "呆呆页面只放行本站与这些域名（后缀匹配，逗号分隔）的请求，其余第三方请求（统计、广告等）一律拦截",
+        "jsdelivr.net,cdnjs.cloudflare.com,unpkg.com,bootcdn.net,staticfile.org",
+    ),
+    "cache_max_entries": GsIntConfig(
+        "缓存条数上限",
+        "上游响应缓存的最大条数，超出后淘汰最久未使用的",
+        512,
+        max_value=10000,
+    ),
+    "cache_ttl_player": GsIntConfig(
+        "玩家数据缓存秒数",
+        "anne 玩家页/搜索、58 玩家数据的缓存时间，0 为不缓存",
+        300,
+        max_value=86400,
+    ),
+    "cache_ttl_status": GsIntConfig(
+        "状态缓存秒数",
+        "服务器状态、聊天记录的缓存时间，0 为不缓存",
+        30,
+        max_value=3600,
+    ),
+    "cache_ttl_awards": GsIntConfig(
+        "荣誉统计缓存秒数",
+        "荣誉殿堂、全服统计的缓存时间，0 为不缓存",
+        7200,
+        max_value=86400,
+    ),
+    "cache_ttl_maps": GsIntConfig(
+        "地图列表缓存秒数",
+        "gamemaps 地图/模组列表的缓存时间，0 为不缓存",
+        900,
+        max_value=86400,
+    ),
+    "cache_ttl_map_detail": GsIntConfig(
+        "地图详情缓存秒数",
+        "gamemaps 地图详情的缓存时间，0 为不缓存",
+        86400,
+        max_value=604800,
+    ),
+    "cache_ttl_negative": GsIntConfig(
+        "查无此人缓存秒数",
+        "玩家不存在/搜索无结果的缓存时间，期间重复查询不再请求上游，0 为不缓存",
+        60,
+        max_value=3600,
+    ),
+    "host_concurrency": GsIntConfig(
+        "单站点并发请求数",
+        "对同一站点（anne / gamemaps 等）同时进行的请求上限，超出的请求排队",
+        4,
+        max_value=50,
+    ),
+    "host_rate": GsIntConfig(
+        "单站点每秒请求数",
+        "对同一站点的平均请求速率（令牌桶），避免触发 Cloudflare 403",
+        4,
+        max_value=100,
+    ),
+    "host_burst": GsIntConfig(
+        "单站点突发请求数",
+        "令牌桶容量，允许短时间内突发的请求数",
+        8,
+        max_value=200,
+    ),
+    "batch_concurrency": GsIntConfig(
+        "批量查询并发数",
+        "排行榜等批量查询玩家时同时进行的查询数，实际请求仍受单站点并发/速率限制",
+        4,
+        max_value=32,
+    ),
+    "http2": GsBoolConfig(
+        "启用HTTP/2",
+        "请求 anne / 58 时启用 HTTP/2（需安装 h2）",
+        False,
+    ),
+    "http_max_connections": GsIntConfig(
+        "单站点最大连接数",
+        "每个站点连接池的最大连接数",
+        10,
+        max_value=100,
+    ),
+    "http_keepalive_expiry": GsIntConfig(
+        "连接保活时间",
+        "空闲连接保留的秒数",
+        60,
+        max_value=600,
+    ),
 }
 
 CONFIG_PATH = get_res_path("L4D2UID") / "config.json"
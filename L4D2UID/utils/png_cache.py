@@ -0,0 +1,225 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from gsuid_core.data_store import get_res_path
+from gsuid_core.logger import logger
+
+from .l4_config import l4d2_config
+
+MB = 1024 * 1024
+
+
+def normalize_keyword(keyword: str) -> str:
+    # 大小写、首尾与连续空白不同的查询视为同一个
+    return " ".join(keyword.split()).lower()
+
+
+def _read_file(path: Path) -> Optional[Tuple[bytes, float]]:
+    try:
+        return path.read_bytes(), path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _write_file(path: Path, data: bytes, stored_at: float):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    os.utime(path, (stored_at, stored_at))
+
+
+def _unlink(paths: List[Path]):
+    for path in paths:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+class PngCache:
+    # 查询结果图片缓存：内存按总字节数 LRU 淘汰；开启落盘时，被挤出内存的图片写入磁盘，
+    # 磁盘同样按总字节数 LRU 淘汰，命中后移回内存。过期时间按写入时间计算，磁盘上以 mtime 记录。
+    # 索引只在事件循环里修改，文件读写放到线程里执行
+    def __init__(self, name: str, config_prefix: str):
+        self.name = name
+        self.prefix = config_prefix
+        self.dir: Path = get_res_path("L4D2UID") / f"{name}_cache"
+        self._mem: OrderedDict[str, Tuple[bytes, float]] = OrderedDict()
+        self._mem_bytes = 0
+        self._disk: Optional[OrderedDict[str, int]] = None
+        self._disk_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _config(self, key: str) -> Any:
+        return l4d2_config.get_config(f"{self.prefix}_{key}").data
+
+    def ttl(self) -> int:
+        return int(self._config("ttl"))
+
+    def _spill(self) -> bool:
+        return bool(self._config("disk"))
+
+    @staticmethod
+    def _key(keyword: str, variant: str) -> str:
+        # variant 区分同一关键词下因查询者不同而内容不同的图片（如带头像的面板）
+        key = normalize_keyword(keyword)
+        return f"{key}\0{variant}" if variant else key
+
+    @staticmethod
+    def _name(key: str) -> str:
+        return f"{hashlib.sha1(key.encode()).hexdigest()}.png"
+
+    def _scan(self) -> Tuple[OrderedDict, int]:
+        items = []
+        if self.dir.is_dir():
+            for p in self.dir.glob("*.png"):
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                items.append((st.st_mtime, p.name, st.st_size))
+        index: OrderedDict[str, int] = OrderedDict()
+        for _, name, size in sorted(items):
+            index[name] = size
+        return index, sum(index.values())
+
+    async def _disk_index(self) -> OrderedDict:
+        # 首次使用时按 mtime 扫描已有文件，重启后磁盘缓存继续可用
+        if self._disk is None:
+            index, total = await asyncio.to_thread(self._scan)
+            if self._disk is None:
+                self._disk, self._disk_bytes = index, total
+        return self._disk  # type: ignore[return-value]
+
+    async def get(self, keyword: str, variants: Sequence[str] = ("",)) -> Optional[bytes]:
+        # 按 variants 顺序查找，命中第一个即返回
+        ttl = self.ttl()
+        if ttl <= 0:
+            return None
+        now = time.time()
+        spill = self._spill()
+        for variant in variants:
+            key = self._key(keyword, variant)
+            item = self._mem.get(key)
+            if item is not None:
+                data, stored_at = item
+                if now - stored_at < ttl:
+                    self._mem.move_to_end(key)
+                    self.hits += 1
+                    return data
+                self._drop_mem(key)
+            if spill:
+                data = await self._get_disk(key, now, ttl)
+                if data is not None:
+                    self.disk_hits += 1
+                    return data
+        self.misses += 1
+        return None
+
+    async def _get_disk(self, key: str, now: float, ttl: int) -> Optional[bytes]:
+        index = await self._disk_index()
+        name = self._name(key)
+        if name not in index:
+            return None
+        item = await asyncio.to_thread(_read_file, self.dir / name)
+        await self._drop_disk(name)
+        if item is None or now - item[1] >= ttl:
+            return None
+        data, stored_at = item
+        # 移回内存，保留原写入时间
+        await self._put_mem(key, data, stored_at)
+        return data
+
+    async def put(self, keyword: str, data: bytes, variant: str = ""):
+        if self.ttl() <= 0:
+            return
+        key = self._key(keyword, variant)
+        if self._spill():
+            # 新结果覆盖磁盘上的旧图
+            await self._drop_disk(self._name(key))
+        await self._put_mem(key, data, time.time())
+
+    async def _put_mem(self, key: str, data: bytes, stored_at: float):
+        self._drop_mem(key)
+        limit = int(self._config("max_mb")) * MB
+        if len(data) > limit:
+            return
+        self._mem[key] = (data, stored_at)
+        self._mem_bytes += len(data)
+        evicted = []
+        while self._mem_bytes > limit:
+            old_key, (old_data, old_at) = self._mem.popitem(last=False)
+            self._mem_bytes -= len(old_data)
+            self.evictions += 1
+            evicted.append((old_key, old_data, old_at))
+        if evicted and self._spill():
+            for item in evicted:
+                await self._put_disk(*item)
+
+    async def _put_disk(self, key: str, data: bytes, stored_at: float):
+        if time.time() - stored_at >= self.ttl():
+            return
+        index = await self._disk_index()
+        limit = int(self._config("disk_mb")) * MB
+        if len(data) > limit:
+            return
+        name = self._name(key)
+        await self._drop_disk(name)
+        try:
+            await asyncio.to_thread(_write_file, self.dir / name, data, stored_at)
+        except OSError as e:
+            logger.warning(f"[l4] 写入{self.name}图片缓存失败: {e}")
+            return
+        index[name] = len(data)
+        self._disk_bytes += len(data)
+        stale = []
+        while self._disk_bytes > limit:
+            old_name, size = index.popitem(last=False)
+            self._disk_bytes -= size
+            stale.append(self.dir / old_name)
+        if stale:
+            await asyncio.to_thread(_unlink, stale)
+
+    def _drop_mem(self, key: str):
+        item = self._mem.pop(key, None)
+        if item is not None:
+            self._mem_bytes -= len(item[0])
+
+    async def _drop_disk(self, name: str):
+        index = await self._disk_index()
+        size = index.pop(name, None)
+        if size is None:
+            return
+        self._disk_bytes -= size
+        await asyncio.to_thread(_unlink, [self.dir / name])
+
+    async def clear(self):
+        self._mem.clear()
+        self._mem_bytes = 0
+        index = await self._disk_index()
+        names = list(index)
+        index.clear()
+        self._disk_bytes = 0
+        await asyncio.to_thread(_unlink, [self.dir / name for name in names])
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._mem),
+            "bytes": self._mem_bytes,
+            "disk_size": len(self._disk) if self._disk is not None else 0,
+            "disk_bytes": self._disk_bytes,
+        }
+
+
+daidai_png_cache = PngCache("daidai", "daidai_cache")
@@ -0,0 +1,119 @@
+import asyncio
+import functools
+import pickle
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar, Union
+
+from gsuid_core.logger import logger
+from gsuid_core.server import on_core_shutdown
+from gsuid_core.utils.image.convert import convert_img
+from PIL import Image
+
+from .l4_config import l4d2_config
+
+T = TypeVar("T")
+
+
+def _func_key(func: Callable[..., Any]) -> Optional[Tuple[str, str]]:
+    qualname = getattr(func, "__qualname__", None)
+    if qualname is None or "<lambda>" in qualname or "<locals>" in qualname:
+        return None
+    return getattr(func, "__module__", ""), qualname
+
+
+def _run_coro(func: Callable[..., Any], *args: Any) -> Any:
+    return asyncio.run(func(*args))
+
+
+class WorkerPool:
+    # 解析/绘图等 CPU 密集任务放到这里，避免阻塞 bot 事件循环
+    def __init__(self):
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self.submitted = 0
+        self.running = 0
+        # 函数 -> 能否交给进程池，每个函数只判断一次
+        self._eligible: Dict[Tuple[str, str], bool] = {}
+
+    @staticmethod
+    def size() -> int:
+        return max(int(l4d2_config.get_config("worker_size").data), 1)
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(self.size(), thread_name_prefix="l4_worker")
+        return self._threads
+
+    def _executor(self) -> Executor:
+        if l4d2_config.get_config("worker_mode").data != "process":
+            return self._thread_pool()
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(self.size())
+        return self._processes
+
+    async def _submit(self, executor: Executor, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        self.submitted += 1
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(func, *args, **kwargs))
+        finally:
+            self.running -= 1
+
+    def _process_eligible(self, func: Callable[..., Any]) -> bool:
+        # 只有模块级函数/方法能按引用传给子进程；只检查函数本身，不预先序列化参数
+        key = _func_key(func)
+        if key is None:
+            return False
+        ok = self._eligible.get(key)
+        if ok is None:
+            try:
+                pickle.dumps(func)
+                ok = True
+            except (pickle.PicklingError, AttributeError, TypeError):
+                ok = False
+                logger.info(f"[l4] {key[1]} 无法序列化, 固定使用线程池")
+            self._eligible[key] = ok
+        return ok
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        executor = self._executor()
+        if executor is self._threads or not self._process_eligible(func):
+            return await self._submit(self._thread_pool(), func, *args, **kwargs)
+        try:
+            return await self._submit(executor, func, *args, **kwargs)
+        except (BrokenProcessPool, pickle.PicklingError) as e:
+            # 只处理进程池自身与参数序列化失败；函数抛出的异常照常向上传递，不重跑
+            logger.warning(f"[l4] 进程池执行 {getattr(func, '__name__', func)} 失败, 改用线程池: {e}")
+            if isinstance(e, BrokenProcessPool):
+                broken, self._processes = self._processes, None
+                if broken is not None:
+                    broken.shutdown(wait=False, cancel_futures=True)
+            return await self._submit(self._thread_pool(), func, *args, **kwargs)
+
+    async def convert_img(self, img: Image.Image) -> Union[str, bytes]:
+        # convert_img 只做同步编码，固定走线程池
+        return await self._submit(self._thread_pool(), _run_coro, convert_img, img)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": l4d2_config.get_config("worker_mode").data,
+            "size": self.size(),
+            "submitted": self.submitted,
+            "running": self.running,
+        }
+
+    def shutdown(self):
+        for executor in (self._threads, self._processes):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._threads = None
+        self._processes = None
+
+
+worker_pool = WorkerPool()
+
+
+@on_core_shutdown
+async def _close_worker_pool():
+    worker_pool.shutdown()
@@ -0,0 +1,110 @@
+# 离线解析基准：用录制页面驱动各解析器，报告耗时与峰值内存，并与快照比对输出防止解析回归
+# 用法: PYTHONPATH=. python test/bench_parsers.py [-n 次数] [--update-snapshot]
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import replay
+
+from L4D2UID.l4_chat.api import chat_api
+from L4D2UID.l4_maps.api import game_maps_api
+from L4D2UID.utils.api.api import ANNEPLAYERAPI
+from L4D2UID.utils.api.cache import response_cache
+from L4D2UID.utils.api.player_parser import parse_player_lxml
+from L4D2UID.utils.l4_api import l4_api
+
+SNAPSHOT = Path(__file__).parent / "fixtures" / "expected.json"
+STEAMID = "STEAM_1:0:203395448"
+QUARTER = "20263"
+
+
+def _player_page(quarter=None) -> bytes:
+    params = {"steamid": STEAMID}
+    if quarter:
+        params["quarter"] = quarter
+    data = replay.read(replay.full_url(ANNEPLAYERAPI, params))
+    assert data is not None
+    return data
+
+
+async def _sync(func, *args):
+    return func(*args)
+
+
+CASES = {
+    "play_info[bs4]": lambda: _sync(l4_api._parse_player_bs4, _player_page()),
+    "play_info[lxml]": lambda: _sync(parse_player_lxml, _player_page()),
+    "play_info[bs4, quarter]": lambda: _sync(l4_api._parse_player_bs4, _player_page(QUARTER), QUARTER),
+    "play_info[lxml, quarter]": lambda: _sync(parse_player_lxml, _player_page(QUARTER), QUARTER),
+    "play_info_58": lambda: l4_api.play_info_58(STEAMID),
+    "search_player": lambda: l4_api._search_player("anne"),
+    "get_online_players": lambda: l4_api.get_online_players(),
+    "get_awards": lambda: l4_api.get_awards(),
+    "get_statistics": lambda: l4_api.get_statistics(),
+    "_parse_row (get_chat_messages)": lambda: chat_api.get_chat_messages(),
+    "_parse_map_item (get_maps)": lambda: game_maps_api.get_maps(),
+    "_parse_map_item (get_latest_maps)": lambda: game_maps_api.get_latest_maps(),
+    "get_map_detail": lambda: game_maps_api.get_map_detail("12345"),
+}
+# 呆呆页面需联网录制（record_fixtures.py daidai/player.html），录制后再 --update-snapshot 纳入快照
+if (replay.FIXTURES / "daidai" / "player.html").exists():
+    CASES["play_info_daidai"] = lambda: l4_api.play_info_daidai(STEAMID)
+
+
+async def bench(factory, rounds: int):
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await factory()
+        times.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    result = await factory()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    p95 = statistics.quantiles(times, n=20)[-1] if len(times) >= 2 else times[0]
+    return result, statistics.mean(times), p95, peak
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--rounds", type=int, default=50)
+    parser.add_argument("--update-snapshot", action="store_true", help="用当前解析结果覆盖快照")
+    args = parser.parse_args()
+
+    replay.install()
+    # 关掉响应缓存，每轮都真实解析
+    response_cache.ttl_for = lambda endpoint: 0
+
+    expected = {} if args.update_snapshot or not SNAPSHOT.exists() else json.loads(SNAPSHOT.read_text("utf-8"))
+    outputs = {}
+    failed = []
+    print(f"{'parser':<36}{'mean ms':>10}{'p95 ms':>10}{'peak KB':>10}")
+    for name, factory in CASES.items():
+        result, mean, p95, peak = await bench(factory, args.rounds)
+        # tuple 等统一成 JSON 形式再比较
+        outputs[name] = json.loads(json.dumps(result, ensure_ascii=False))
+        mark = ""
+        if isinstance(result, int) or not result:
+            mark = "  <- 空结果/错误码"
+            failed.append(name)
+        elif name in expected and expected[name] != outputs[name]:
+            mark = "  <- 与快照不一致"
+            failed.append(name)
+        print(f"{name:<36}{mean:>10.2f}{p95:>10.2f}{peak / 1024:>10.0f}{mark}")
+
+    if args.update_snapshot or not SNAPSHOT.exists():
+        SNAPSHOT.write_text(json.dumps(outputs, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+        print(f"快照已写入 {SNAPSHOT}")
+    if failed:
+        print(f"失败: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,162 @@
+# 离线绘图基准：用录制数据驱动各绘图入口，报告耗时、峰值 RSS 与输出大小，超出预算时返回非 0
+# 用法: PYTHONPATH=. python test/bench_render.py [-n 次数] [--budget test/render_budget.json]
+import argparse
+import asyncio
+import gc
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import replay
+from PIL import Image
+
+from L4D2UID.l4_chat.api import chat_api
+from L4D2UID.l4_chat.draw import draw_chat_messages
+from L4D2UID.l4_info.anne import draw_anne_player_img
+from L4D2UID.l4_info.api58 import draw_api58_player_img
+from L4D2UID.l4_info.status import draw_awards_img, draw_server_status_img
+from L4D2UID.l4_maps import draw as maps_draw
+from L4D2UID.l4_maps.api import game_maps_api
+from L4D2UID.utils.api.api import ANNEPLAYERAPI
+from L4D2UID.utils.api.player_parser import parse_player_lxml
+from L4D2UID.utils.l4_api import l4_api
+
+IMAGES = replay.FIXTURES / "gamemaps" / "images"
+DEFAULT_BUDGET = Path(__file__).parent / "render_budget.json"
+STEAMID = "STEAM_1:0:203395448"
+QUARTER = "20263"
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # 非 Linux 只能拿到进程历史峰值
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class RssSampler:
+    def __init__(self, interval: float = 0.002):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, rss_bytes())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.peak = rss_bytes()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes())
+
+
+async def local_thumb(url: str):
+    # 用本地图片代替 gamemaps 缩略图/截图下载
+    if not url:
+        return None
+    name = "screenshot.jpg" if "/ss/" in url else "thumb.jpg"
+    return Image.open(IMAGES / name).convert("RGBA")
+
+
+async def load_inputs() -> dict:
+    page = replay.read(replay.full_url(ANNEPLAYERAPI, {"steamid": STEAMID}))
+    quarter_page = replay.read(replay.full_url(ANNEPLAYERAPI, {"steamid": STEAMID, "quarter": QUARTER}))
+    status, players = await l4_api.get_status_snapshot()
+    groups = defaultdict(list)
+    for msg in await chat_api.get_chat_messages():
+        groups[msg["server"]].append(msg)
+    return {
+        "detail": parse_player_lxml(page),
+        "quarter": parse_player_lxml(quarter_page, QUARTER),
+        "api58": await l4_api.play_info_58(STEAMID),
+        "status": status,
+        "players": players,
+        "awards": await l4_api.get_awards(),
+        "chat": dict(groups),
+        "maps": await game_maps_api.get_maps(),
+        "map_detail": await game_maps_api.get_map_detail("12345"),
+    }
+
+
+def panels(data: dict) -> dict:
+    avatar = Image.open(IMAGES / "thumb.jpg").convert("RGBA")
+    return {
+        "draw_anne_player_img": lambda: draw_anne_player_img(data["detail"], avatar, data["quarter"], QUARTER),
+        "draw_api58_player_img": lambda: draw_api58_player_img(data["api58"]),
+        "draw_server_status_img": lambda: draw_server_status_img(data["status"], data["players"]),
+        "draw_awards_img": lambda: draw_awards_img(data["awards"]),
+        "draw_chat_messages": lambda: draw_chat_messages(data["chat"], server_name="全部服务器"),
+        "draw_maps_list": lambda: maps_draw.draw_maps_list(data["maps"], "地图"),
+        "draw_map_detail": lambda: maps_draw.draw_map_detail(data["map_detail"]),
+    }
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--rounds", type=int, default=3)
+    parser.add_argument("--budget", type=Path, default=DEFAULT_BUDGET, help="预算 JSON: {面板: {ms, rss_mb, kb}}")
+    args = parser.parse_args()
+
+    replay.install()
+    maps_draw._download_thumb = local_thumb
+    budget = json.loads(args.budget.read_text("utf-8")) if args.budget.exists() else {}
+    data = await load_inputs()
+
+    over = []
+    print(f"{'panel':<26}{'mean ms':>10}{'max ms':>10}{'peak RSS MB':>13}{'output KB':>11}")
+    for name, factory in panels(data).items():
+        times = []
+        rss_growth = 0
+        size = 0
+        for _ in range(args.rounds):
+            gc.collect()
+            with RssSampler() as sampler:
+                base = sampler.peak
+                start = time.perf_counter()
+                out = await factory()
+                times.append((time.perf_counter() - start) * 1000)
+            rss_growth = max(rss_growth, sampler.peak - base)
+            size = len(out)
+        mean_ms = statistics.mean(times)
+        rss_mb = rss_growth / 1024 / 1024
+        kb = size / 1024
+
+        limits = budget.get(name, {})
+        exceeded = [
+            f"{key} {value:.1f} > {limits[key]}"
+            for key, value in (("ms", mean_ms), ("rss_mb", rss_mb), ("kb", kb))
+            if key in limits and value > limits[key]
+        ]
+        mark = f"  <- 超出预算: {', '.join(exceeded)}" if exceeded else ""
+        if exceeded:
+            over.append(name)
+        print(f"{name:<26}{mean_ms:>10.1f}{max(times):>10.1f}{rss_mb:>13.1f}{kb:>11.1f}{mark}")
+
+    if over:
+        print(f"超出预算: {', '.join(over)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
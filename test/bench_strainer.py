@@ -0,0 +1,82 @@
+# 对比整页解析与 SoupStrainer 局部解析：结果是否一致、解析耗时与峰值内存
+# 用法: PYTHONPATH=. python test/bench_strainer.py [次数]
+import asyncio
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from L4D2UID.l4_chat import api as chat_module
+from L4D2UID.utils.api import request as request_module
+from L4D2UID.utils.api import strainer
+from L4D2UID.utils.l4_api import l4_api
+
+FIXTURES = Path(__file__).parent / "fixtures"
+ROUNDS = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+# (fixture, strainer 名, 调用的解析方法)
+CASES = [
+    ("anne/search.html", "SEARCH_ONLY", lambda: l4_api.search_player("bench")),
+    ("anne/status.html", "STATUS_ONLY", lambda: l4_api.get_status_snapshot()),
+    ("anne/awards.html", "AWARDS_ONLY", lambda: l4_api.get_awards()),
+    ("anne/statistics.html", "STATISTICS_ONLY", lambda: l4_api.get_statistics()),
+    ("chat/chat.html", "CHAT_ONLY", lambda: chat_module.chat_api.get_chat_messages()),
+]
+
+
+def set_strainer(name: str, value):
+    for module in (request_module, chat_module):
+        if hasattr(module, name):
+            setattr(module, name, value)
+
+
+def measure(data: bytes, parse_only):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        BeautifulSoup(data, "lxml", parse_only=parse_only)
+    ms = (time.perf_counter() - start) * 1000 / ROUNDS
+    tracemalloc.start()
+    BeautifulSoup(data, "lxml", parse_only=parse_only)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return ms, peak
+
+
+async def main() -> int:
+    failed = False
+    for fixture, name, call in CASES:
+        data = (FIXTURES / fixture).read_bytes()
+
+        async def fake_request(*args, **kwargs):
+            return data
+
+        async def fake_html(url):
+            return data.decode("utf-8")
+
+        l4_api._l4_request = fake_request
+        chat_module.chat_api._fetch_html = fake_html
+
+        parse_only = getattr(strainer, name)
+        set_strainer(name, None)
+        full = await call()
+        set_strainer(name, parse_only)
+        partial = await call()
+        if full != partial:
+            failed = True
+            print(f"[FAIL] {fixture}: 局部解析结果与整页解析不一致")
+            continue
+
+        full_ms, full_peak = measure(data, None)
+        part_ms, part_peak = measure(data, parse_only)
+        print(
+            f"[OK] {fixture} ({len(data) / 1024:.1f}KB): "
+            f"整页 {full_ms:.2f}ms / {full_peak / 1024:.0f}KB, "
+            f"局部 {part_ms:.2f}ms / {part_peak / 1024:.0f}KB "
+            f"(耗时 -{(1 - part_ms / full_ms) * 100:.0f}%, 内存 -{(1 - part_peak / full_peak) * 100:.0f}%)"
+        )
+    return 1 if failed else 0
+
+
+sys.exit(asyncio.run(main()))
@@ -0,0 +1,78 @@
+# 熔断器半开探测被取消 / 抛出未列出的异常后，过了恢复时间仍能放行下一次请求
+# 用法: PYTHONPATH=. python test/check_breaker.py
+import asyncio
+import sys
+
+from L4D2UID.utils.api.resilience import CircuitBreaker, RetryPolicy, circuit_breakers, retry_call
+
+HOST = "breaker.test"
+NO_WAIT = RetryPolicy(attempts=1, base_delay=0)
+
+
+async def fail():
+    raise ConnectionError("down")
+
+
+async def hang():
+    await asyncio.sleep(3600)
+
+
+async def bad_decode():
+    raise ValueError("undecodable body")
+
+
+async def ok():
+    return "ok"
+
+
+def open_breaker(url: str) -> CircuitBreaker:
+    breaker = circuit_breakers.get(url)
+    breaker.recovery_timeout = 0.2
+    return breaker
+
+
+async def call(url: str, func):
+    return await retry_call(url, func, -1, exceptions=(ConnectionError,), policy=NO_WAIT)
+
+
+async def trip(url: str, breaker: CircuitBreaker):
+    for _ in range(breaker.failure_threshold):
+        await call(url, fail)
+    assert breaker.state == CircuitBreaker.OPEN, breaker.state
+    await asyncio.sleep(breaker.recovery_timeout + 0.05)
+
+
+async def main() -> int:
+    failed = False
+
+    # 1. 半开探测被取消
+    url = f"http://cancel.{HOST}/"
+    breaker = open_breaker(url)
+    await trip(url, breaker)
+    probe = asyncio.create_task(call(url, hang))
+    await asyncio.sleep(0.01)
+    assert breaker.state == CircuitBreaker.HALF_OPEN, breaker.state
+    probe.cancel()
+    await asyncio.gather(probe, return_exceptions=True)
+    await asyncio.sleep(breaker.recovery_timeout + 0.05)
+    result = await call(url, ok)
+    print(f"{'[OK]  ' if result == 'ok' else '[FAIL]'} 探测取消后恢复: {result} ({breaker.state})")
+    failed |= result != "ok"
+
+    # 2. 半开探测抛出 exceptions 之外的异常
+    url = f"http://raise.{HOST}/"
+    breaker = open_breaker(url)
+    await trip(url, breaker)
+    try:
+        await call(url, bad_decode)
+    except ValueError:
+        pass
+    await asyncio.sleep(breaker.recovery_timeout + 0.05)
+    result = await call(url, ok)
+    print(f"{'[OK]  ' if result == 'ok' else '[FAIL]'} 探测异常后恢复: {result} ({breaker.state})")
+    failed |= result != "ok"
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,55 @@
+# 用手写样例页检查呆呆统计页解析：标签按完全相等/前缀匹配，排名行与统计区域外的文字不参与取值
+# 用法: PYTHONPATH=. python test/check_daidai_parser.py
+# 真实页面录制后（record_fixtures.py daidai/player.html）由 bench_parsers.py 的快照覆盖
+import sys
+from pathlib import Path
+
+from L4D2UID.utils.api.daidai_parser import classify_label, parse_daidai_player
+
+FIXTURE = Path(__file__).parent / "fixtures" / "daidai" / "sample_handwritten.html"
+
+LABELS = {
+    "积分": "source",
+    "积分：": "source",
+    "积分排名": None,
+    "击杀特感": "kills",
+    "击杀排名": None,
+    "最后上线": "lasttime",
+    "最后更新": None,
+    "玩家": "name",
+    "玩家ID": None,
+    "PPM": "ppm",
+}
+
+EXPECTED = {
+    ("info", "name"): "测试玩家",
+    ("info", "steamid"): "STEAM_1:0:123456",
+    ("info", "avatar"): "https://avatars.steamstatic.com/abc_full.jpg",
+    ("info", "playtime"): "120 小时",
+    ("info", "lasttime"): "2026-10-16 22:10",
+    ("detail", "source"): "12,345",
+    ("detail", "kills"): "6,789",
+    ("detail", "avg_headshots"): "45.6%",
+    ("detail", "avg_source"): "3.21",
+    ("sur", "pills_give"): "42",
+}
+
+failed = False
+for label, field in LABELS.items():
+    got = classify_label(label)
+    if got != field:
+        failed = True
+        print(f"[FAIL] classify_label({label!r}) = {got!r}, 应为 {field!r}")
+
+player = parse_daidai_player(FIXTURE.read_bytes())
+if isinstance(player, int):
+    print(f"[FAIL] {FIXTURE.name}: 解析返回 {player}")
+    sys.exit(1)
+for (part, key), want in EXPECTED.items():
+    got = player[part][key]
+    if got != want:
+        failed = True
+        print(f"[FAIL] {part}.{key} = {got!r}, 应为 {want!r}")
+
+print("[FAIL]" if failed else "[OK]", FIXTURE.name)
+sys.exit(1 if failed else 0)
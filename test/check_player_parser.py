@@ -0,0 +1,37 @@
+# 对比 bs4 / lxml 两种玩家页解析结果是否一致，并粗略比较耗时
+# 用法: PYTHONPATH=. python test/check_player_parser.py [次数]
+import sys
+import time
+from pathlib import Path
+
+from L4D2UID.utils.api.player_parser import parse_player_lxml
+from L4D2UID.utils.l4_api import l4_api
+
+FIXTURES = Path(__file__).parent / "fixtures" / "anne"
+ROUNDS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+failed = False
+for path in sorted(FIXTURES.glob("player*.html")):
+    data = path.read_bytes()
+    # 文件名带 quarter 的按季度页面解析
+    quarter = "current" if "quarter" in path.stem else None
+    old = l4_api._parse_player_bs4(data, quarter)
+    new = parse_player_lxml(data, quarter)
+    if old != new:
+        failed = True
+        print(f"[FAIL] {path.name}")
+        print(f"  bs4:  {old}")
+        print(f"  lxml: {new}")
+        continue
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        l4_api._parse_player_bs4(data, quarter)
+    bs4_ms = (time.perf_counter() - start) * 1000 / ROUNDS
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        parse_player_lxml(data, quarter)
+    lxml_ms = (time.perf_counter() - start) * 1000 / ROUNDS
+    print(f"[OK] {path.name}: bs4 {bs4_ms:.2f}ms, lxml {lxml_ms:.2f}ms")
+
+sys.exit(1 if failed else 0)
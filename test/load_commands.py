@@ -0,0 +1,221 @@
+# 命令级压测：用合成的 Bot / Event 按 QPS 和命令配比直接调用各 SV 处理函数，上游指向本地模拟服务器
+# 报告各命令 p50/p95/p99 延迟、上游请求数与事件循环延迟，用于活动前评估部署规格
+# 用法: PYTHONPATH=. python test/load_commands.py [--qps 5] [--duration 30]
+#                                                  [--mix info=4,status=2,chat=2,maps=1,stats=1]
+#                                                  [--latency 80] [--jitter 40] [--error-rate 0] [--forbidden-rate 0]
+#                                                  [--upstream http://127.0.0.1:18080] [--no-cache]
+# 不指定 --upstream 时在本进程内启动 mock_upstream；查询命令需要绑定，会为合成用户写入测试绑定并在结束后删除
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+import httpx
+from mock_upstream import HOST_ENVS, MockUpstream
+
+STEAMID = "STEAM_1:0:203395448"
+BOT_ID = "l4_load"
+USER_PREFIX = "l4_load_"
+GROUP_PREFIX = "l4_load_group_"
+DEFAULT_MIX = "info=4,status=2,chat=2,maps=1,stats=1"
+# 每个命令随机取一个参数，覆盖常见用法
+ARGS = {
+    "info": [""],
+    "status": [""],
+    "chat": ["", "云1", "30", "云2 80"],
+    "maps": ["", "12345"],
+    "stats": [""],
+}
+
+
+class LoadBot:
+    def __init__(self):
+        self.replies: List[object] = []
+
+    async def send(self, message, *args, **kwargs):
+        self.replies.append(message)
+
+    async def send_option(self, message, *args, **kwargs):
+        self.replies.append(message)
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in ARGS:
+            raise SystemExit(f"未知命令 {name}，可选: {', '.join(ARGS)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def percentile(values: List[float], p: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0
+    return statistics.quantiles(values, n=100, method="inclusive")[p - 1]
+
+
+async def lag_probe(stop: asyncio.Event, samples: List[float], interval: float = 0.01):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        samples.append((loop.time() - start - interval) * 1000)
+
+
+def upstream_stats(base_url: str, reset: bool = False) -> Dict[str, int]:
+    return httpx.get(f"{base_url}/__stats", params={"reset": 1} if reset else None, timeout=10).json()
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--qps", type=float, default=5)
+    parser.add_argument("--duration", type=float, default=30, help="发压秒数")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="命令配比，可选 info/status/chat/maps/stats")
+    parser.add_argument("--users", type=int, default=20, help="合成用户数")
+    parser.add_argument("--groups", type=int, default=5, help="合成群数")
+    parser.add_argument("--upstream", help="外部 mock_upstream 地址，不填则在本进程内启动")
+    parser.add_argument("--latency", type=float, default=80)
+    parser.add_argument("--jitter", type=float, default=40)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--forbidden-rate", type=float, default=0)
+    parser.add_argument("--no-cache", action="store_true", help="关闭响应缓存，每条命令都打到上游")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+
+    mock = None
+    if args.upstream:
+        base_url = args.upstream.rstrip("/")
+    else:
+        mock = MockUpstream(0, args.latency, args.jitter, args.error_rate, args.forbidden_rate, args.seed)
+        base_url = mock.start()
+    # 上游地址在导入时读取，必须先设置环境变量再导入插件
+    os.environ.update({name: base_url for name in HOST_ENVS})
+
+    from gsuid_core.models import Event
+
+    from L4D2UID.l4_chat import send_l4_chat_msg
+    from L4D2UID.l4_info import send_l4_info_msg, send_server_status_msg, send_statistics_msg
+    from L4D2UID.l4_maps import send_l4_maps_msg
+    from L4D2UID.utils.api.cache import response_cache
+    from L4D2UID.utils.database.models import L4D2Bind
+    from L4D2UID.utils.worker import worker_pool
+
+    handlers = {
+        "info": send_l4_info_msg,
+        "status": send_server_status_msg,
+        "chat": send_l4_chat_msg,
+        "maps": send_l4_maps_msg,
+        "stats": send_statistics_msg,
+    }
+    if args.no_cache:
+        response_cache.ttl_for = lambda endpoint: 0
+
+    users = [f"{USER_PREFIX}{i}" for i in range(args.users)]
+    try:
+        for user_id in users:
+            await L4D2Bind.switch_steam32(user_id, BOT_ID, STEAMID)
+    except Exception as e:
+        print(f"[WARN] 写入测试绑定失败，l4查询 将只返回未绑定提示: {e}")
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    outcomes: Dict[str, Counter] = defaultdict(Counter)
+
+    async def fire(name: str):
+        bot = LoadBot()
+        ev = Event(
+            bot_id=BOT_ID,
+            user_id=rng.choice(users),
+            group_id=f"{GROUP_PREFIX}{rng.randrange(args.groups)}",
+            user_type="group",
+            text=rng.choice(ARGS[name]),
+            # 头像也走模拟上游，避免压测时访问真实头像服务
+            sender={"avatar": f"{base_url}/img/avatar.jpg"},
+        )
+        start = time.perf_counter()
+        try:
+            await handlers[name](bot, ev)
+        except Exception as e:
+            outcomes[name][f"异常 {type(e).__name__}"] += 1
+        else:
+            # 图片回复算成功，文字回复一般是错误提示
+            if any(isinstance(r, bytes) for r in bot.replies):
+                outcomes[name]["图片"] += 1
+            elif bot.replies:
+                outcomes[name]["文字"] += 1
+            else:
+                outcomes[name]["无回复"] += 1
+        latencies[name].append((time.perf_counter() - start) * 1000)
+
+    if mock is not None:
+        mock.reset()
+    else:
+        upstream_stats(base_url, reset=True)
+
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    total = int(args.qps * args.duration)
+    lag_samples: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(lag_probe(stop, lag_samples))
+    loop = asyncio.get_running_loop()
+    begin = loop.time()
+    tasks = []
+    print(f"上游 {base_url}，{args.qps} QPS x {args.duration}s，共 {total} 条命令，配比 {args.mix}")
+    # 开环发压：按固定节奏发出命令，不等待上一条完成
+    for i in range(total):
+        delay = begin + i / args.qps - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(fire(rng.choices(names, weights)[0])))
+    await asyncio.gather(*tasks)
+    elapsed = loop.time() - begin
+    stop.set()
+    await probe
+
+    hits = mock.stats() if mock is not None else upstream_stats(base_url)
+
+    try:
+        for user_id in users:
+            await L4D2Bind.delete_row(user_id=user_id, bot_id=BOT_ID)
+    except Exception as e:
+        print(f"[WARN] 清理测试绑定失败: {e}")
+    worker_pool.shutdown()
+    if mock is not None:
+        mock.stop()
+
+    print(f"\n实际耗时 {elapsed:.1f}s，完成 {sum(len(v) for v in latencies.values())} 条")
+    print(f"{'command':<10}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}  结果")
+    for name in names:
+        values = latencies.get(name, [])
+        if not values:
+            continue
+        result = ", ".join(f"{k} {v}" for k, v in outcomes[name].most_common())
+        print(
+            f"{name:<10}{len(values):>7}{percentile(values, 50):>10.0f}{percentile(values, 95):>10.0f}"
+            f"{percentile(values, 99):>10.0f}{max(values):>10.0f}  {result}"
+        )
+
+    print(f"\n上游请求 {hits.pop('<total>', 0)} 次")
+    for name, count in sorted(hits.items(), key=lambda kv: -kv[1]):
+        print(f"  {name:<32}{count:>6}")
+
+    if lag_samples:
+        print(
+            f"\n事件循环延迟: p50 {percentile(lag_samples, 50):.1f}ms  p99 {percentile(lag_samples, 99):.1f}ms  "
+            f"max {max(lag_samples):.1f}ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,167 @@
+# 本地模拟上游：按 manifest 把 anne / 58 / gamemaps / 呆呆 的请求映射到录制文件，可注入延迟、5xx 与 Cloudflare 式 403
+# 用法: PYTHONPATH=. python test/mock_upstream.py [--port 18080] [--latency 80] [--jitter 40]
+#                                                 [--error-rate 0.05] [--forbidden-rate 0.02]
+# 启动后按提示设置 L4D2UID_*_HOST 环境变量，再启动 gsuid_core 即可让插件打到本地
+# GET /__stats 返回各录制文件的命中次数（JSON），/__stats?reset=1 同时清零
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import replay
+
+HOST_ENVS = ("L4D2UID_ANNE_HOST", "L4D2UID_API58_HOST", "L4D2UID_GAMEMAPS_HOST", "L4D2UID_DAIDAI_HOST")
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".json": "application/json; charset=utf-8",
+    ".jpg": "image/jpeg",
+    ".png": "image/png",
+}
+FORBIDDEN_BODY = b"<html><head><title>Just a moment...</title></head><body>Checking your browser</body></html>"
+
+
+class MockUpstream:
+    def __init__(
+        self,
+        port: int = 0,
+        latency: float = 0,
+        jitter: float = 0,
+        error_rate: float = 0,
+        forbidden_rate: float = 0,
+        seed: Optional[int] = None,
+    ):
+        # latency / jitter 单位为毫秒
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.forbidden_rate = forbidden_rate
+        self.counts: Counter = Counter()
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def env(self) -> Dict[str, str]:
+        return {name: self.base_url for name in HOST_ENVS}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+    def reset(self):
+        with self._lock:
+            self.counts.clear()
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock_upstream", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _pick(self) -> Optional[int]:
+        with self._lock:
+            roll = self._random.random()
+            delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if roll < self.forbidden_rate:
+            return 403
+        if roll < self.forbidden_rate + self.error_rate:
+            return 500
+        return None
+
+    def _handler(self):
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status: int, body: bytes, content_type: str = "text/plain; charset=utf-8"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if status == 403:
+                    self.send_header("Server", "cloudflare")
+                    self.send_header("cf-mitigated", "challenge")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                if parts.path == "/__stats":
+                    if "reset" in parse_qs(parts.query):
+                        stats = upstream.stats()
+                        upstream.reset()
+                    else:
+                        stats = upstream.stats()
+                    self._reply(200, json.dumps(stats, ensure_ascii=False).encode(), CONTENT_TYPES[".json"])
+                    return
+
+                path = replay.resolve(self.path)
+                name = path.relative_to(replay.FIXTURES).as_posix() if path else "<unmatched>"
+                with upstream._lock:
+                    upstream.counts[name] += 1
+                    upstream.counts["<total>"] += 1
+
+                injected = upstream._pick()
+                if injected == 403:
+                    self._reply(403, FORBIDDEN_BODY, CONTENT_TYPES[".html"])
+                elif injected == 500:
+                    self._reply(500, b"injected error")
+                elif path is None or not path.exists():
+                    self._reply(404, b"not recorded")
+                else:
+                    self._reply(200, path.read_bytes(), CONTENT_TYPES.get(path.suffix, "application/octet-stream"))
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                self.do_GET()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--latency", type=float, default=0, help="每个请求的基础延迟 (ms)")
+    parser.add_argument("--jitter", type=float, default=0, help="延迟抖动 ±ms")
+    parser.add_argument("--error-rate", type=float, default=0, help="返回 500 的比例 0~1")
+    parser.add_argument("--forbidden-rate", type=float, default=0, help="返回 Cloudflare 式 403 的比例 0~1")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    upstream = MockUpstream(args.port, args.latency, args.jitter, args.error_rate, args.forbidden_rate, args.seed)
+    print(f"模拟上游已启动: {upstream.base_url}")
+    for name, value in upstream.env().items():
+        print(f"  export {name}={value}")
+    try:
+        upstream._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        upstream._server.server_close()
+        print(json.dumps(upstream.stats(), ensure_ascii=False, indent=1))
+
+
+if __name__ == "__main__":
+    main()
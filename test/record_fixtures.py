@@ -0,0 +1,57 @@
+# 按 test/fixtures/manifest.json 重新录制上游页面（需要联网）
+# 用法: PYTHONPATH=. python test/record_fixtures.py [fixture名 ...]
+#   例: python test/record_fixtures.py anne/player.html gamemaps/details.html
+import sys
+
+import httpx
+from replay import FIXTURES, load_manifest
+
+from L4D2UID.utils.api.request import L4D2Api
+
+
+def fetch(entry: dict) -> bytes:
+    if entry.get("scraper"):
+        # gamemaps / 聊天页需要过 Cloudflare
+        import cloudscraper
+
+        scraper = cloudscraper.create_scraper()
+        resp = scraper.get(
+            entry["url"],
+            params=entry.get("params"),
+            cookies={"ANNEWEB_STEAM": L4D2Api._COOKIE.split("=", 1)[1]},
+            timeout=30,
+        )
+        resp.raise_for_status()
+        return resp.content
+    headers = dict(L4D2Api._HEADER)
+    headers["Cookie"] = L4D2Api._COOKIE
+    resp = httpx.get(entry["url"], params=entry.get("params"), headers=headers, verify=False, timeout=30)
+    resp.raise_for_status()
+    return resp.content
+
+
+def main():
+    manifest = load_manifest()
+    names = sys.argv[1:] or list(manifest)
+    for name in names:
+        entry = manifest.get(name)
+        if entry is None:
+            print(f"[SKIP] {name}: manifest 中没有该项")
+            continue
+        if "url" not in entry:
+            # 仅用于回放的本地文件（如缩略图）
+            print(f"[SKIP] {name}: 无录制地址")
+            continue
+        try:
+            body = fetch(entry)
+        except Exception as e:
+            print(f"[FAIL] {name}: {e}")
+            continue
+        path = FIXTURES / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+        print(f"[OK] {name}: {len(body) / 1024:.1f}KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# 录制页面回放：把插件的上游请求改为读取 test/fixtures 下的录制文件，完全离线
+# 用法:
+#   import replay
+#   replay.install()
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode, urlsplit
+
+import httpx
+
+FIXTURES = Path(__file__).parent / "fixtures"
+MANIFEST = FIXTURES / "manifest.json"
+
+
+def load_manifest() -> Dict[str, dict]:
+    return json.loads(MANIFEST.read_text(encoding="utf-8"))
+
+
+_ROUTES: List[Tuple[re.Pattern, Path]] = [
+    (re.compile(entry["match"]), FIXTURES / name) for name, entry in load_manifest().items()
+]
+
+
+def full_url(url: str, params: Optional[dict] = None) -> str:
+    if not params:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
+
+
+def resolve(url: str) -> Optional[Path]:
+    # 只按路径+查询串匹配，与上游地址无关；manifest 中靠前的规则优先
+    parts = urlsplit(url)
+    target = f"{parts.path}?{parts.query}" if parts.query else parts.path
+    for pattern, path in _ROUTES:
+        if pattern.search(target):
+            return path
+    return None
+
+
+def read(url: str) -> Optional[bytes]:
+    path = resolve(url)
+    if path is None or not path.exists():
+        return None
+    return path.read_bytes()
+
+
+def _response(url: str, body: Optional[bytes]) -> httpx.Response:
+    request = httpx.Request("GET", url)
+    if body is None:
+        return httpx.Response(404, content=b"not recorded", request=request)
+    return httpx.Response(200, content=body, request=request)
+
+
+def install():
+    # 替换到各 API 的最底层发送函数，缓存、合并、解析逻辑保持原样
+    from L4D2UID.l4_chat.api import ChatApi
+    from L4D2UID.l4_maps.api import GameMapsApi
+    from L4D2UID.utils.api.api import API58PLAYER, DAIDAIPLAYERAPI
+    from L4D2UID.utils.api.request import L4D2Api
+
+    async def _send(self, method, url, header, params, json, data):
+        target = full_url(url, params)
+        return _response(target, read(target))
+
+    async def _send_58(self, steam_id):
+        target = full_url(API58PLAYER, {"steamid": steam_id})
+        return _response(target, read(target))
+
+    async def _send_daidai(self, keyword):
+        target = f"{DAIDAIPLAYERAPI}{quote(keyword)}"
+        return _response(target, read(target))
+
+    async def _get_html(self, url):
+        body = read(url)
+        return body.decode("utf-8") if body is not None else None
+
+    L4D2Api._send = _send
+    L4D2Api._send_58 = _send_58
+    L4D2Api._send_daidai = _send_daidai
+    ChatApi._get_html = _get_html
+    GameMapsApi._get_html = _get_html